@@ -0,0 +1,170 @@
+"""
+A2A Codec - pluggable serialization of A2A request and response bodies
+Shared by the remote agents (Flask and ASGI) and the host agents' A2A clients
+
+  A2A_JSON_CODEC       orjson (default when installed) or json (stdlib)
+  A2A_MSGPACK          1 = clients prefer application/msgpack, 0 = do not offer it (default: offered
+                       when msgpack is installed, preferred only if orjson is not)
+
+Codecs are chosen per message by media type: a request body is decoded
+according to its Content-Type, and the reply is encoded in the type the
+client Accepts (else the request's own type, else JSON). JSON bodies use the
+fastest available implementation; other media types plug in with
+register_codec(). MessagePack is one: agents accept and answer it, while
+the host clients ask for it first only when they would otherwise decode with
+stdlib json, since orjson decodes JSON faster than msgpack decodes the
+smaller body. Agents without it (or older ones) simply answer JSON.
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class CodecError(ValueError):
+    """A request body that cannot be decoded; status is the HTTP status to answer with"""
+    status = 400
+
+
+class UnsupportedMediaType(CodecError):
+    status = 415
+
+
+class Codec:
+    """Encoder/decoder pair for one media type; dumps returns bytes"""
+
+    def __init__(self, name, media_type, dumps, loads):
+        self.name = name
+        self.media_type = media_type
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _json_dumps(obj):
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Interchangeable implementations of application/json
+JSON_CODECS = {"json": Codec("json", JSON_MEDIA_TYPE, _json_dumps, json.loads)}
+if orjson is not None:
+    JSON_CODECS["orjson"] = Codec("orjson", JSON_MEDIA_TYPE, _orjson_dumps, orjson.loads)
+
+JSON_CODEC_NAME = os.environ.get("A2A_JSON_CODEC", "orjson" if orjson is not None else "json")
+if JSON_CODEC_NAME not in JSON_CODECS:
+    print(f"⚠ A2A_JSON_CODEC={JSON_CODEC_NAME} is not available, using the stdlib json codec")
+    JSON_CODEC_NAME = "json"
+json_codec = JSON_CODECS[JSON_CODEC_NAME]
+
+# Media type -> codec, in the order clients prefer them
+CODECS = {JSON_MEDIA_TYPE: json_codec}
+
+
+def register_codec(codec, preferred=False):
+    """Make a codec available for its media type; preferred codecs are asked for first by clients"""
+    others = {media_type: other for media_type, other in CODECS.items() if media_type != codec.media_type}
+    CODECS.clear()
+    if preferred:
+        CODECS[codec.media_type] = codec
+    CODECS.update(others)
+    CODECS[codec.media_type] = codec
+
+
+def _msgpack_dumps(obj):
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def _msgpack_loads(data):
+    return msgpack.unpackb(data, raw=False)
+
+
+MSGPACK_MODE = os.environ.get("A2A_MSGPACK", "auto")
+if msgpack is not None and MSGPACK_MODE != "0":
+    register_codec(Codec("msgpack", MSGPACK_MEDIA_TYPE, _msgpack_dumps, _msgpack_loads),
+                   preferred=MSGPACK_MODE == "1" or json_codec.name == "json")
+
+
+def _media_type(content_type):
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def codec_for(content_type):
+    """Codec for a Content-Type header; a missing one means JSON"""
+    media_type = _media_type(content_type) or JSON_MEDIA_TYPE
+    codec = CODECS.get(media_type)
+    if codec is None:
+        raise UnsupportedMediaType(f"Unsupported Content-Type: {media_type} "
+                                   f"(use one of: {', '.join(CODECS)})")
+    return codec
+
+
+def decode(body, content_type):
+    """Decode a message body according to its Content-Type"""
+    codec = codec_for(content_type)
+    try:
+        return codec.loads(body)
+    except ValueError as e:
+        raise CodecError(f"Invalid {codec.media_type} body: {str(e) or type(e).__name__}") from None
+
+
+def negotiate(accept, content_type=None):
+    """Codec for a reply: the best registered type in Accept, else the request's type, else JSON"""
+    ranked = []
+    for position, entry in enumerate((accept or "").split(",")):
+        media_type, _, params = entry.partition(";")
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            ranked.append((-quality, position, media_type))
+
+    for _, _, media_type in sorted(ranked):
+        if media_type in CODECS:
+            return CODECS[media_type]
+        if media_type in ("*/*", "application/*"):
+            break
+    return CODECS.get(_media_type(content_type)) or CODECS[JSON_MEDIA_TYPE]
+
+
+def accept_header():
+    """Accept header listing every registered media type, most preferred first"""
+    media_types = list(CODECS)
+    return ", ".join([media_types[0]] + [f"{media_type};q=0.9" for media_type in media_types[1:]])
+
+
+def request_headers(codec=None):
+    """Content-Type and Accept headers for an A2A request body encoded with codec"""
+    codec = codec or json_codec
+    return {"Content-Type": codec.media_type, "Accept": accept_header()}
+
+
+def read_request(request):
+    """Decoded body of a Flask request"""
+    return decode(request.get_data(cache=False), request.content_type)
+
+
+def make_response(app, request, obj, status=200):
+    """Flask response encoded with the codec the request negotiated"""
+    codec = negotiate(request.headers.get("Accept"), request.content_type)
+    return app.response_class(codec.dumps(obj), status=status, mimetype=codec.media_type)
@@ -0,0 +1,102 @@
+"""
+A2A HTTP - persistent connection pools for host-to-agent calls
+Used by travel_host_agent.py (requests / httpx) and travel_host_agent_async.py
+(httpx.AsyncClient); one session per remote agent
+
+  A2A_HTTP_POOL_SIZE      keep-alive connections kept open per agent (default 10)
+  A2A_HTTP_KEEPALIVE      seconds an idle connection is kept / TCP keepalive idle time (default 60)
+  A2A_HTTP2=1             multiplex calls over HTTP/2 (needs httpx[http2] and an HTTP/2 capable agent)
+"""
+
+import os
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+HTTP_POOL_SIZE = int(os.environ.get("A2A_HTTP_POOL_SIZE", "10"))
+HTTP_KEEPALIVE = int(os.environ.get("A2A_HTTP_KEEPALIVE", "60"))
+HTTP2 = os.environ.get("A2A_HTTP2", "0") == "1"
+
+
+def _keepalive_socket_options(idle_seconds):
+    """TCP options that keep idle pooled connections alive and detect dead peers"""
+    options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options += [
+            (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle_seconds),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+        ]
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """requests adapter with a bounded keep-alive pool and TCP keepalive enabled"""
+
+    def __init__(self, pool_size, keepalive):
+        self.socket_options = _keepalive_socket_options(keepalive)
+        # One host per session, so a single pool holding pool_size connections
+        super().__init__(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_session(pool_size=None, keepalive=None, http2=None):
+    """Return a pooled HTTP session exposing requests-style get()/post()
+
+    HTTP/2 uses httpx with prior knowledge (one multiplexed connection per
+    agent); without httpx's h2 extra it falls back to HTTP/1.1 keep-alive.
+    """
+    pool_size = pool_size or HTTP_POOL_SIZE
+    keepalive = keepalive or HTTP_KEEPALIVE
+    if HTTP2 if http2 is None else http2:
+        try:
+            import h2  # noqa: F401  (httpx needs it for http2=True)
+            import httpx
+        except ImportError:
+            print("⚠ HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1")
+        else:
+            return httpx.Client(
+                http1=False, http2=True,
+                limits=httpx.Limits(max_connections=pool_size,
+                                    max_keepalive_connections=pool_size,
+                                    keepalive_expiry=keepalive)
+            )
+
+    session = requests.Session()
+    adapter = KeepAliveAdapter(pool_size, keepalive)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_body(session, url, body, headers, timeout):
+    """POST an already encoded body with either kind of session create_session() returns"""
+    if isinstance(session, requests.Session):
+        return session.post(url, data=body, headers=headers, timeout=timeout)
+    return session.post(url, content=body, headers=headers, timeout=timeout)
+
+
+def create_async_session(pool_size=None, keepalive=None, http2=None):
+    """Return a pooled httpx.AsyncClient for the asyncio host agent"""
+    import httpx
+
+    pool_size = pool_size or HTTP_POOL_SIZE
+    keepalive = keepalive or HTTP_KEEPALIVE
+    http2 = HTTP2 if http2 is None else http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("⚠ HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1")
+            http2 = False
+    return httpx.AsyncClient(
+        http1=not http2, http2=http2,
+        limits=httpx.Limits(max_connections=pool_size,
+                            max_keepalive_connections=pool_size,
+                            keepalive_expiry=keepalive)
+    )
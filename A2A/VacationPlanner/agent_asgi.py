@@ -0,0 +1,130 @@
+"""
+Agent ASGI - the A2A endpoints of a remote agent as an asyncio (Starlette) app
+Used by hotel_booking_agent_async.py and flight_booking_agent_async.py
+
+  AGENT_ASYNC_THREADS     tool calls running at once (default 40)
+
+Same contract as the Flask apps: /agent/capabilities (ETag, max-age),
+/agent/execute, /agent/execute_batch and /health. The agent classes stay the
+business layer; AsyncAgent makes their tool calls awaitable by running them
+on a bounded thread pool, so a waiting request costs the event loop a
+coroutine instead of a thread while bookings wait on locks or storage.
+"""
+
+import os
+import time
+
+import anyio
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from werkzeug.http import parse_etags, quote_etag
+
+from a2a_codec import CodecError, decode, negotiate
+from agent_logging import get_logger, log_batch, log_execute
+
+ASYNC_THREADS = int(os.environ.get("AGENT_ASYNC_THREADS", "40"))
+
+
+class AsyncAgent:
+    """Awaitable tool execution for a HotelBookingAgent or FlightBookingAgent"""
+
+    def __init__(self, agent, max_threads=None):
+        self.agent = agent
+        self.name = agent.name
+        self._limiter = None
+        self._max_threads = max_threads or ASYNC_THREADS
+
+    @property
+    def limiter(self):
+        # Created on first use, inside the running event loop
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self._max_threads)
+        return self._limiter
+
+    async def execute_tool(self, tool_name, parameters):
+        """Execute a tool and return result (ADK Format)"""
+        return await anyio.to_thread.run_sync(self.agent.execute_tool, tool_name, parameters,
+                                              limiter=self.limiter)
+
+    async def execute_batch(self, calls):
+        """Execute several tool calls in order, with one thread hop for the batch"""
+        return await anyio.to_thread.run_sync(self._execute_batch, calls, limiter=self.limiter)
+
+    def _execute_batch(self, calls):
+        results = []
+        for call in calls:
+            if not isinstance(call, dict):
+                results.append({"success": False, "error": "Each call must be an object with tool_name and parameters"})
+                continue
+            results.append(self.agent.execute_tool(call.get('tool_name'), call.get('parameters', {})))
+        return results
+
+
+async def _read_request(request):
+    """Decoded request body according to its Content-Type"""
+    return decode(await request.body(), request.headers.get("content-type"))
+
+
+def _respond(request, obj, status_code=200):
+    """Response encoded with the codec the request negotiated"""
+    codec = negotiate(request.headers.get("accept"), request.headers.get("content-type"))
+    return Response(codec.dumps(obj), status_code=status_code, media_type=codec.media_type)
+
+
+async def _codec_error(request, error):
+    """Request bodies that cannot be decoded (400) or use an unsupported Content-Type (415)"""
+    return _respond(request, {"success": False, "error": str(error)}, error.status)
+
+
+def create_agent_app(agent, max_age, max_threads=None):
+    """Build the ASGI app for an agent; max_age is the capabilities Cache-Control max-age"""
+    async_agent = AsyncAgent(agent, max_threads)
+    logger = get_logger(agent.name)
+
+    async def capabilities(request):
+        """A2A Discovery endpoint - returns available tools in ADK format"""
+        body, etag = agent.capabilities_document()
+        headers = {"ETag": quote_etag(etag), "Cache-Control": f"public, max-age={max_age}"}
+        if parse_etags(request.headers.get("If-None-Match")).contains_weak(etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    async def execute(request):
+        """A2A Execute endpoint - ADK tool execution format"""
+        data = await _read_request(request)
+        if not isinstance(data, dict):
+            return _respond(request, {"success": False, "error": "Body must be an object with tool_name and parameters"}, 400)
+        tool_name = data.get('tool_name')
+        parameters = data.get('parameters', {})
+
+        started = time.perf_counter()
+        result = await async_agent.execute_tool(tool_name, parameters)
+        log_execute(logger, tool_name, parameters, result, time.perf_counter() - started)
+        return _respond(request, result)
+
+    async def execute_batch(request):
+        """A2A Batch execute endpoint - runs several ADK tool calls, results in request order"""
+        data = await _read_request(request)
+        calls = data.get('calls') if isinstance(data, dict) else None
+        if not isinstance(calls, list):
+            return _respond(request, {"success": False, "error": "Body must contain a 'calls' list"}, 400)
+
+        started = time.perf_counter()
+        results = await async_agent.execute_batch(calls)
+        log_batch(logger, calls, results, time.perf_counter() - started)
+        return _respond(request, {"results": results})
+
+    async def health(request):
+        """Health check endpoint"""
+        return _respond(request, {"status": "healthy", "agent": agent.name})
+
+    return Starlette(
+        routes=[
+            Route("/agent/capabilities", capabilities, methods=["GET"]),
+            Route("/agent/execute", execute, methods=["POST"]),
+            Route("/agent/execute_batch", execute_batch, methods=["POST"]),
+            Route("/health", health, methods=["GET"])
+        ],
+        exception_handlers={CodecError: _codec_error}
+    )
@@ -0,0 +1,77 @@
+"""
+Agent Logging - level-gated, queued logging for the remote agents' request paths
+Shared by hotel_booking_agent.py, flight_booking_agent.py, agent_asgi.py and the host's tool dispatch
+
+  AGENT_LOG_LEVEL      DEBUG, INFO (default), WARNING, ...
+
+A request thread only puts the record on a queue (QueueHandler); a
+background QueueListener writes it to stderr. Messages are key=value lines
+with %-style arguments, so a DEBUG record carrying a full tool result is
+never formatted unless DEBUG is enabled.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOG_LEVEL = os.environ.get("AGENT_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+_root = logging.getLogger("a2a")
+_queue = queue.SimpleQueue()
+_handler = logging.StreamHandler(sys.stderr)
+_listener = None
+
+
+def _start_listener():
+    global _listener
+    _listener = logging.handlers.QueueListener(_queue, _handler)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging(level=None, stream=None):
+    """Change the log level and/or output stream of all agent loggers"""
+    if level is not None:
+        _root.setLevel(level.upper() if isinstance(level, str) else level)
+    if stream is not None:
+        _handler.setStream(stream)
+
+
+def get_logger(name):
+    """Logger for an agent (a2a.<name>), writing through the shared background queue"""
+    if _listener is None:
+        _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        _root.addHandler(logging.handlers.QueueHandler(_queue))
+        _root.setLevel(LOG_LEVEL)
+        _root.propagate = False
+        _start_listener()
+        atexit.register(_stop_listener)
+        # A forked worker (gunicorn with preloading) has the queue but not the listener thread
+        os.register_at_fork(after_in_child=_start_listener)
+    return _root.getChild(name)
+
+
+def log_execute(logger, tool_name, parameters, result, duration):
+    """Log one /agent/execute call; parameters and result are only formatted at DEBUG"""
+    if result["success"]:
+        logger.info("execute tool=%s success=true duration_ms=%.2f", tool_name, duration * 1000)
+    else:
+        logger.info("execute tool=%s success=false duration_ms=%.2f error=%r",
+                    tool_name, duration * 1000, result["error"])
+    logger.debug("execute tool=%s parameters=%r result=%r", tool_name, parameters, result.get("result"))
+
+
+def log_batch(logger, calls, results, duration):
+    """Log one /agent/execute_batch call; the calls and results are only formatted at DEBUG"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("execute_batch calls=%d succeeded=%d duration_ms=%.2f",
+                    len(results), sum(result["success"] for result in results), duration * 1000)
+    logger.debug("execute_batch calls=%r results=%r", calls, results)
@@ -0,0 +1,167 @@
+"""
+Agent Tools - decorator-based tool registry for the remote agents
+Shared by hotel_booking_agent.py and flight_booking_agent.py
+
+Each tool is an agent method decorated with @registry.tool(description,
+**parameter_schemas). The registry builds the ADK tool definition from the
+method's signature (parameters without a default are required), compiles a
+validator from that schema once, and dispatches calls by name with a dict
+lookup. Invalid parameters raise ValueError before the method runs.
+"""
+
+import inspect
+
+# JSON schema type -> check returning the (possibly converted) value, or raising ValueError
+_TYPE_NAMES = {
+    "string": "a string",
+    "number": "a number",
+    "integer": "an integer",
+    "boolean": "a boolean",
+    "array": "a list",
+    "object": "an object"
+}
+
+
+def _check_string(value):
+    if isinstance(value, str):
+        return value
+    raise TypeError
+
+
+def _check_number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    raise TypeError
+
+
+def _check_integer(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    # Models often send whole numbers as floats (2.0)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise TypeError
+
+
+def _check_boolean(value):
+    if isinstance(value, bool):
+        return value
+    raise TypeError
+
+
+def _check_array(value):
+    if isinstance(value, list):
+        return value
+    raise TypeError
+
+
+def _check_object(value):
+    if isinstance(value, dict):
+        return value
+    raise TypeError
+
+
+_TYPE_CHECKS = {
+    "string": _check_string,
+    "number": _check_number,
+    "integer": _check_integer,
+    "boolean": _check_boolean,
+    "array": _check_array,
+    "object": _check_object
+}
+
+
+def _compile_property(name, schema):
+    """Validator for one parameter value"""
+    type_check = _TYPE_CHECKS[schema["type"]]
+    type_error = f"Parameter '{name}' must be {_TYPE_NAMES[schema['type']]}"
+    allowed = frozenset(schema["enum"]) if "enum" in schema else None
+    enum_error = f"Parameter '{name}' must be one of: {', '.join(map(str, schema.get('enum', ())))}"
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+
+    def check(value):
+        try:
+            value = type_check(value)
+        except TypeError:
+            raise ValueError(type_error) from None
+        if allowed is not None and value not in allowed:
+            raise ValueError(enum_error)
+        if minimum is not None and value < minimum:
+            raise ValueError(f"Parameter '{name}' must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"Parameter '{name}' must be at most {maximum}")
+        return value
+
+    return check
+
+
+def compile_validator(tool_name, schema):
+    """Build a function that validates a tool's parameters against its schema and returns the call arguments"""
+    checks = {name: _compile_property(name, prop) for name, prop in schema.get("properties", {}).items()}
+    required = tuple(schema.get("required", ()))
+
+    def validate(parameters):
+        if parameters is None:
+            parameters = {}
+        if not isinstance(parameters, dict):
+            raise ValueError(f"Parameters of {tool_name} must be an object")
+        for name in required:
+            if parameters.get(name) is None:
+                raise ValueError(f"Missing required parameter: {name}")
+        arguments = {}
+        for name, value in parameters.items():
+            check = checks.get(name)
+            if check is None:
+                raise ValueError(f"Unknown parameter for {tool_name}: {name}")
+            # null means "not given" for optional parameters
+            if value is not None:
+                arguments[name] = check(value)
+        return arguments
+
+    return validate
+
+
+class AgentToolRegistry:
+    """Tools of one agent class: definitions in ADK format plus validated dispatch"""
+
+    def __init__(self):
+        self.definitions = []
+        self._tools = {}
+
+    def tool(self, description, **parameter_schemas):
+        """Register the decorated method as a tool; keyword arguments give each parameter's schema"""
+
+        def register(method):
+            signature = inspect.signature(method)
+            names = [name for name in signature.parameters if name != "self"]
+            if set(names) != set(parameter_schemas):
+                raise TypeError(f"Schemas of {method.__name__} do not match its parameters")
+
+            schema = {
+                "type": "object",
+                "properties": {name: parameter_schemas[name] for name in names}
+            }
+            required = [name for name in names if signature.parameters[name].default is inspect.Parameter.empty]
+            if required:
+                schema["required"] = required
+
+            if method.__name__ in self._tools:
+                raise ValueError(f"Duplicate tool: {method.__name__}")
+            self.definitions.append({
+                "name": method.__name__,
+                "description": description,
+                "parameters": schema
+            })
+            self._tools[method.__name__] = (method, compile_validator(method.__name__, schema))
+            return method
+
+        return register
+
+    def dispatch(self, agent, tool_name, parameters):
+        """Validate parameters and run the named tool on agent"""
+        entry = self._tools.get(tool_name)
+        if entry is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+        method, validate = entry
+        return method(agent, **validate(parameters))
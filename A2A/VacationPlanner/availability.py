@@ -0,0 +1,262 @@
+"""
+Availability - date-aware inventory for hotel rooms and flight seats
+Used by hotel_booking_agent.py (rooms per night) and flight_booking_agent.py (seats per date)
+"""
+
+from array import array
+from datetime import date, datetime
+from itertools import groupby
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD string into a date"""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+class NightCalendar:
+    """Segment tree over nights holding the number of rooms booked per night
+
+    Supports adding to a range of nights and reading the busiest night of a
+    range, both in O(log n). Each node stores the maximum of its subtree plus
+    the pending add for the whole subtree, so no push-down is needed.
+    """
+
+    def __init__(self, nights):
+        self.nights = nights
+        self._size = 1
+        while self._size < nights:
+            self._size *= 2
+        self._max = array("i", bytes(4 * 2 * self._size))
+        self._add = array("i", bytes(4 * 2 * self._size))
+
+    def booked(self, first, last):
+        """Return the most rooms booked on any night in [first, last)"""
+        return self._query(1, 0, self._size, first, last)
+
+    def add(self, first, last, rooms):
+        """Add rooms (negative to release) to every night in [first, last)"""
+        self._update(1, 0, self._size, first, last, rooms)
+
+    def counts(self):
+        """Rooms booked on each night, in order, in O(n)"""
+        # A leaf's count is the sum of the pending adds on its path from the root
+        totals = array("i", self._add)
+        for node in range(2, 2 * self._size):
+            totals[node] += totals[node // 2]
+        return totals[self._size:self._size + self.nights]
+
+    def shifted(self, days):
+        """New calendar of the same size with night i moved to night i - days"""
+        calendar = NightCalendar(self.nights)
+        night = -days
+        for rooms, run in groupby(self.counts()):
+            length = len(list(run))
+            first, last = max(night, 0), min(night + length, self.nights)
+            if rooms and first < last:
+                calendar.add(first, last, rooms)
+            night += length
+        return calendar
+
+    def _query(self, node, low, high, first, last):
+        if first <= low and high <= last:
+            return self._max[node]
+        middle = (low + high) // 2
+        if last <= middle:
+            best = self._query(2 * node, low, middle, first, last)
+        elif first >= middle:
+            best = self._query(2 * node + 1, middle, high, first, last)
+        else:
+            best = max(self._query(2 * node, low, middle, first, last),
+                       self._query(2 * node + 1, middle, high, first, last))
+        return best + self._add[node]
+
+    def _update(self, node, low, high, first, last, rooms):
+        if first <= low and high <= last:
+            self._add[node] += rooms
+            self._max[node] += rooms
+            return
+        middle = (low + high) // 2
+        if first < middle:
+            self._update(2 * node, low, middle, first, last, rooms)
+        if last > middle:
+            self._update(2 * node + 1, middle, high, first, last, rooms)
+        self._max[node] = max(self._max[2 * node], self._max[2 * node + 1]) + self._add[node]
+
+
+class RoomAvailability:
+    """Per-hotel night calendars over a booking window that rolls forward with the date
+
+    Bookings are open from today for horizon_days nights. A hotel's calendar
+    is created on its first booking and spans twice the window from the day
+    it starts at; when the window runs past its end, the next reserve,
+    restore or release rebases it to today and drops the nights already
+    past. Hotels without a calendar have every room free. Callers serialize
+    reserve/release per hotel, which also covers rebasing; rooms_left only
+    reads.
+    """
+
+    def __init__(self, horizon_days=365, today=date.today):
+        self.horizon_days = horizon_days
+        self.today = today
+        self._calendars = {}  # hotel_id -> (date of night 0, NightCalendar)
+
+    def _nights(self, check_in, check_out, today):
+        first = (check_in - today).days
+        last = (check_out - today).days
+        if first < 0:
+            raise ValueError("Check-in date cannot be in the past")
+        if last > self.horizon_days:
+            raise ValueError(f"Bookings are only open for the next {self.horizon_days} days")
+        if last <= first:
+            raise ValueError("Check-out must be after check-in")
+        return first, last
+
+    def _calendar(self, hotel_id, today, create=False):
+        """A hotel's calendar and today's night in it, rebased first if the window outgrew it"""
+        entry = self._calendars.get(hotel_id)
+        if entry is None:
+            if not create:
+                return None, 0
+            entry = self._calendars[hotel_id] = (today, NightCalendar(2 * self.horizon_days))
+        origin, calendar = entry
+        offset = (today - origin).days
+        if offset < 0 or offset + self.horizon_days > calendar.nights:
+            calendar = calendar.shifted(offset)
+            self._calendars[hotel_id] = (today, calendar)
+            offset = 0
+        return calendar, offset
+
+    def rooms_left(self, hotel_id, capacity, check_in, check_out):
+        """Return rooms free on every night from check_in up to check_out"""
+        today = self.today()
+        first, last = self._nights(check_in, check_out, today)
+        entry = self._calendars.get(hotel_id)
+        if entry is None:
+            return capacity
+        # Read without rebasing: nights past the end of a calendar not yet
+        # rebased cannot have been booked
+        origin, calendar = entry
+        offset = (today - origin).days
+        first, last = max(offset + first, 0), min(offset + last, calendar.nights)
+        if first >= last:
+            return capacity
+        return capacity - calendar.booked(first, last)
+
+    def reserve(self, hotel_id, capacity, check_in, check_out, rooms=1):
+        """Book rooms for each night of the stay, or raise ValueError if any night is full"""
+        if rooms < 1:
+            raise ValueError("At least one room must be booked")
+        today = self.today()
+        first, last = self._nights(check_in, check_out, today)
+        calendar, offset = self._calendar(hotel_id, today, create=True)
+        first, last = offset + first, offset + last
+        if capacity - calendar.booked(first, last) < rooms:
+            raise ValueError("No rooms available for the selected dates")
+        calendar.add(first, last, rooms)
+
+    def _open_nights(self, check_in, check_out, today):
+        """Nights of a stay inside today's window, or None if it has none"""
+        first = max((check_in - today).days, 0)
+        last = min((check_out - today).days, self.horizon_days)
+        return (first, last) if last > first else None
+
+    def restore(self, hotel_id, check_in, check_out, rooms=1):
+        """Re-apply an existing booking at startup, keeping only nights inside the window"""
+        today = self.today()
+        nights = self._open_nights(check_in, check_out, today)
+        if nights:
+            calendar, offset = self._calendar(hotel_id, today, create=True)
+            calendar.add(offset + nights[0], offset + nights[1], rooms)
+
+    def release(self, hotel_id, check_in, check_out, rooms=1):
+        """Return rooms for each night of a cancelled stay that is still ahead"""
+        today = self.today()
+        nights = self._open_nights(check_in, check_out, today)
+        calendar, offset = self._calendar(hotel_id, today)
+        if calendar is not None and nights:
+            calendar.add(offset + nights[0], offset + nights[1], -rooms)
+
+
+class SeatInventory:
+    """Seats sold per (flight, date), materialized lazily from the schedule
+
+    The schedule template (a flight's seat count) is the capacity on every
+    date. A flight gets a compact array of seats sold per day only when it is
+    first booked, grown up to the latest booked date, so memory stays within
+    two bytes per flight-day of the booking window. The window starts today
+    and rolls forward: the next reserve, restore or release after midnight
+    drops a flight's past days from the front of its array. Callers
+    serialize reserve/release per flight; seats_left only reads.
+    """
+
+    def __init__(self, horizon_days=365, today=date.today):
+        self.horizon_days = horizon_days
+        self.today = today
+        self._sold = {}  # flight_id -> (date of index 0, array of seats sold per day)
+
+    def _day(self, travel_date, today):
+        day = (travel_date - today).days
+        if day < 0:
+            raise ValueError("Travel date cannot be in the past")
+        if day >= self.horizon_days:
+            raise ValueError(f"Bookings are only open for the next {self.horizon_days} days")
+        return day
+
+    def _days_sold(self, flight_id, today, create=False):
+        """A flight's seats sold per day from today, rolled forward first if needed"""
+        entry = self._sold.get(flight_id)
+        if entry is None:
+            if not create:
+                return None
+            entry = self._sold[flight_id] = (today, array("H"))
+        origin, sold = entry
+        if origin != today:
+            # A new array, so unlocked readers never see the old origin with shifted days
+            shift = (today - origin).days
+            sold = sold[shift:] if shift > 0 else array("H", bytes(-2 * shift)) + sold
+            self._sold[flight_id] = (today, sold)
+        return sold
+
+    def seats_left(self, flight_id, capacity, travel_date):
+        """Return seats still free on the given date"""
+        self._day(travel_date, self.today())
+        entry = self._sold.get(flight_id)
+        if entry is None:
+            return capacity
+        origin, sold = entry
+        day = (travel_date - origin).days
+        if not 0 <= day < len(sold):
+            return capacity
+        return capacity - sold[day]
+
+    def reserve(self, flight_id, capacity, travel_date, seats):
+        """Sell seats on the given date, or raise ValueError if not enough are left"""
+        if seats < 1:
+            raise ValueError("At least one seat must be booked")
+        today = self.today()
+        day = self._day(travel_date, today)
+        sold = self._days_sold(flight_id, today, create=True)
+        if day >= len(sold):
+            sold.extend([0] * (day + 1 - len(sold)))
+        left = capacity - sold[day]
+        if left < seats:
+            raise ValueError(f"Not enough seats available. Only {left} seats left")
+        sold[day] += seats
+
+    def restore(self, flight_id, travel_date, seats):
+        """Re-apply an existing booking at startup; dates outside the window are skipped"""
+        today = self.today()
+        day = (travel_date - today).days
+        if 0 <= day < self.horizon_days:
+            sold = self._days_sold(flight_id, today, create=True)
+            if day >= len(sold):
+                sold.extend([0] * (day + 1 - len(sold)))
+            sold[day] += seats
+
+    def release(self, flight_id, travel_date, seats):
+        """Return seats of a cancelled booking that has not departed yet"""
+        today = self.today()
+        sold = self._days_sold(flight_id, today)
+        day = (travel_date - today).days
+        if sold is not None and 0 <= day < len(sold):
+            sold[day] -= seats
@@ -0,0 +1,68 @@
+"""
+Agent Logging Benchmark - /agent/execute throughput with logging at INFO vs DEBUG
+Run from the VacationPlanner directory: python benchmarks/bench_agent_logging.py [--requests 5000]
+
+Calls the hotel agent's Flask app in-process (test client, no network) with
+a search that returns --hotels hotels, so the DEBUG run pays for formatting
+full result payloads. Log output goes to /dev/null.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hotel_booking_agent  # noqa: E402
+from agent_logging import configure_logging  # noqa: E402
+
+LOCATION = "Benchmark City"
+
+
+def add_hotels(count):
+    for i in range(count):
+        hotel_booking_agent.add_hotel({
+            "id": f"bench-{i}",
+            "name": f"Benchmark Hotel {i}",
+            "location": LOCATION,
+            "price_per_night": 100 + i % 300,
+            "available_rooms": 10,
+            "rating": 3.0 + (i % 20) / 10,
+            "amenities": ["WiFi", "Breakfast", "Pool"]
+        })
+
+
+def measure(client, count, payload):
+    started = time.perf_counter()
+    for _ in range(count):
+        response = client.post("/agent/execute", json=payload)
+        if not response.get_json()["success"]:
+            raise SystemExit(f"Tool call failed: {response.get_json()}")
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per level")
+    parser.add_argument("--hotels", type=int, default=50, help="hotels returned per search")
+    args = parser.parse_args()
+
+    add_hotels(args.hotels)
+    payload = {"tool_name": "search_hotels", "parameters": {"location": LOCATION, "limit": args.hotels}}
+    client = hotel_booking_agent.app.test_client()
+    devnull = open(os.devnull, "w")
+    configure_logging(stream=devnull)
+
+    print(f"{args.requests} requests per level, {args.hotels} hotels per result")
+    rates = {}
+    for level in ("INFO", "DEBUG"):
+        configure_logging(level=level)
+        measure(client, min(200, args.requests), payload)  # warm up
+        rates[level] = measure(client, args.requests, payload)
+        print(f"  {level:<6} {rates[level]:8,.0f} req/s")
+    print(f"  INFO / DEBUG = {rates['INFO'] / rates['DEBUG']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Agent Server Benchmark - /agent/execute requests/sec: Flask dev server, serve.py (gunicorn), ASGI agent
+Stop any agent already listening on port 5000, then run from the VacationPlanner directory:
+python benchmarks/bench_agent_server.py [--clients 16] [--seconds 10]
+
+Each run starts the hotel agent in a subprocess, waits for /health, and has
+--clients threads, each with its own keep-alive session, call
+get_hotel_details for --seconds seconds.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URL = "http://localhost:5000"
+PAYLOAD = {"tool_name": "get_hotel_details", "parameters": {"hotel_id": "1"}}
+
+SERVERS = {
+    "dev": [sys.executable, "hotel_booking_agent.py"],
+    "serve.py": [sys.executable, "serve.py", "hotel"],
+    "asgi": [sys.executable, "hotel_booking_agent_async.py"]
+}
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def wait_until_up(process, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("Agent exited during startup (is port 5000 already in use?)")
+        try:
+            if requests.get(f"{URL}/health", timeout=1).ok:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("Agent did not start")
+
+
+def client(deadline, latencies, errors):
+    session = requests.Session()
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            result = session.post(f"{URL}/agent/execute", json=PAYLOAD, timeout=30).json()
+            if not result.get("success"):
+                errors.append(result)
+        except requests.exceptions.RequestException as e:
+            errors.append(str(e))
+        latencies.append((time.perf_counter() - started) * 1e3)
+
+
+def run(label, command, clients, seconds, env):
+    process = subprocess.Popen(command, cwd=AGENT_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    try:
+        wait_until_up(process)
+        latencies, errors = [], []
+        deadline = time.time() + seconds
+        threads = [threading.Thread(target=client, args=(deadline, latencies, errors)) for _ in range(clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        # The dev server runs with the debug reloader, which serves from a child process
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+
+    print(f"  {label:<9} {len(latencies) / elapsed:8,.0f} req/s  p50={percentile(latencies, 0.5):6.1f}ms  "
+          f"p99={percentile(latencies, 0.99):6.1f}ms  errors={len(errors)}")
+    return len(latencies) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16, help="concurrent client threads")
+    parser.add_argument("--seconds", type=float, default=10, help="duration of each run")
+    parser.add_argument("--threads", default="16", help="AGENT_THREADS for serve.py")
+    args = parser.parse_args()
+
+    # Both servers use the default in-memory store
+    env = dict(os.environ, AGENT_THREADS=args.threads)
+    env.pop("HOTEL_BACKEND", None)
+    env.pop("HOTEL_BOOKING_STORE", None)
+
+    print(f"{args.clients} clients, {args.seconds:g}s per server, {os.cpu_count()} CPU(s)")
+    rates = {label: run(label, command, args.clients, args.seconds, env) for label, command in SERVERS.items()}
+    for label in ("serve.py", "asgi"):
+        print(f"  {label} / dev = {rates[label] / rates['dev']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
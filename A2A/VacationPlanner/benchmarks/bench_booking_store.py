@@ -0,0 +1,121 @@
+"""
+Booking Store Benchmark - write latency and recovery time of the WAL store
+Run from the VacationPlanner directory: python benchmarks/bench_booking_store.py [--count 10000000]
+
+Writes --count hotel bookings, snapshots, appends a --tail of further writes
+(half of them cancellations) and then measures how long a restart takes to
+recover the whole state.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from booking_store import MemoryBookingStore, WalBookingStore  # noqa: E402
+
+
+def make_booking(number):
+    booking_id = f"BK{number}"
+    return booking_id, {
+        "booking_id": booking_id,
+        "hotel_id": str(number % 500 + 1),
+        "hotel_name": "Marriott",
+        "guest_name": f"Guest {number}",
+        "check_in": "2026-12-01",
+        "check_out": "2026-12-05",
+        "num_guests": 2,
+        "nights": 4,
+        "price_per_night": 250,
+        "total_cost": 1000,
+        "status": "confirmed",
+        "created_at": "2026-10-17T12:00:00"
+    }
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def measure_writes(store, count):
+    """Return per-write latencies in microseconds"""
+    latencies = []
+    for number in range(count):
+        booking_id, booking = make_booking(number)
+        started = time.perf_counter()
+        store[booking_id] = booking
+        latencies.append((time.perf_counter() - started) * 1e6)
+    return latencies
+
+
+def report_latency(label, latencies):
+    print(f"  {label:<28} p50={percentile(latencies, 0.5):8.1f}us  "
+          f"p99={percentile(latencies, 0.99):8.1f}us  max={max(latencies):10.1f}us")
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000_000, help="bookings covered by the snapshot")
+    parser.add_argument("--tail", type=int, default=100_000, help="writes logged after the snapshot")
+    parser.add_argument("--latency-samples", type=int, default=20_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-booking-store-")
+    try:
+        print("=" * 70)
+        print("Booking write latency")
+        print("=" * 70)
+        report_latency("memory", measure_writes(MemoryBookingStore(), args.latency_samples))
+
+        store = WalBookingStore(os.path.join(workdir, "batched"))
+        report_latency("wal: (async commit)", measure_writes(store, args.latency_samples))
+        store.close()
+
+        store = WalBookingStore(os.path.join(workdir, "sync"), sync_commit=True)
+        report_latency("wal+sync: (group commit)", measure_writes(store, min(args.latency_samples, 2_000)))
+        store.close()
+
+        print("\n" + "=" * 70)
+        print(f"Recovery: {args.count:,} bookings in snapshot + {args.tail:,} tail writes")
+        print("=" * 70)
+        path = os.path.join(workdir, "recovery")
+        store = WalBookingStore(path, snapshot_every=args.count + args.tail + 1)
+
+        started = time.perf_counter()
+        for number in range(args.count):
+            booking_id, booking = make_booking(number)
+            store[booking_id] = booking
+        store.flush()
+        print(f"  load:      {time.perf_counter() - started:8.2f}s")
+
+        started = time.perf_counter()
+        store.snapshot()
+        print(f"  snapshot:  {time.perf_counter() - started:8.2f}s")
+
+        for number in range(args.tail):
+            booking_id, booking = make_booking(args.count + number // 2)
+            if number % 2:
+                booking["status"] = "cancelled"
+            store[booking_id] = booking
+        store.close()
+        print(f"  on disk:   {directory_size(path) / 1e6:8.1f} MB ({', '.join(sorted(os.listdir(path)))})")
+
+        started = time.perf_counter()
+        recovered = WalBookingStore(path)
+        elapsed = time.perf_counter() - started
+        print(f"  recovery:  {elapsed:8.2f}s for {len(recovered):,} bookings")
+        recovered.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
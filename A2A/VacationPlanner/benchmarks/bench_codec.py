@@ -0,0 +1,79 @@
+"""
+A2A Codec Benchmark - encode/decode time of large search_flights results per JSON codec
+Run from the VacationPlanner directory: python benchmarks/bench_codec.py [--sizes 100,1000,10000]
+
+Each size adds that many flights on one route and serializes the
+/agent/execute reply of a search returning all of them: with Flask's jsonify
+encoder (what the agents used before), and with every codec in
+a2a_codec.JSON_CODECS.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flight_booking_agent  # noqa: E402
+from a2a_codec import JSON_CODECS  # noqa: E402
+
+ORIGIN, DESTINATION = "Benchmark Origin", "Benchmark Destination"
+
+
+def add_flights(start, count):
+    for i in range(start, start + count):
+        flight_booking_agent.add_flight({
+            "id": f"BM{i:05d}",
+            "airline": "Benchmark Air",
+            "flight_number": f"BA{i}",
+            "origin": ORIGIN,
+            "destination": DESTINATION,
+            "departure_time": f"{i % 24:02d}:{i % 60:02d}",
+            "arrival_time": f"{(i + 7) % 24:02d}:{i % 60:02d}",
+            "price": 100 + i % 700,
+            "available_seats": 150,
+            "class": "Economy"
+        })
+
+
+def best_of(function, argument, repeat):
+    """Fastest of repeat runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma-separated result set sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    app = flight_booking_agent.app
+    flask_dumps = app.json.dumps
+    added = 0
+    for size in map(int, args.sizes.split(",")):
+        add_flights(added, size - added)
+        added = size
+        reply = flight_booking_agent.flight_agent.execute_tool(
+            "search_flights", {"origin": ORIGIN, "destination": DESTINATION})
+        assert reply["result"]["count"] == size
+
+        print(f"\n{size} flights")
+        with app.app_context():
+            encoded = flask_dumps(reply)
+            encode_ms = best_of(flask_dumps, reply, args.repeat)
+        print(f"  {'jsonify':<8} encode={encode_ms:8.2f}ms  size={len(encoded.encode()):>10,} bytes")
+        for name, codec in JSON_CODECS.items():
+            encoded = codec.dumps(reply)
+            encode_ms = best_of(codec.dumps, reply, args.repeat)
+            decode_ms = best_of(codec.loads, encoded, args.repeat)
+            print(f"  {name:<8} encode={encode_ms:8.2f}ms  decode={decode_ms:8.2f}ms  size={len(encoded):>10,} bytes")
+
+
+if __name__ == "__main__":
+    main()
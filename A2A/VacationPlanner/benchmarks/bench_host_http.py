@@ -0,0 +1,78 @@
+"""
+Host HTTP Benchmark - per-call latency of A2A tool calls, new connection vs pooled keep-alive
+Start hotel_booking_agent.py first, then run from the VacationPlanner directory:
+python benchmarks/bench_host_http.py [--calls 10000]
+
+"unpooled" repeats what the host used to do (a module-level requests.post,
+one TCP connection per call); "pooled" goes through A2AHotelClient.call_tool
+and its keep-alive session. --http2 adds a run over HTTP/2, which needs
+httpx[http2] and an agent served by an HTTP/2 capable server.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from travel_host_agent import HOTEL_AGENT_URL, A2AHotelClient  # noqa: E402
+
+TOOL_NAME = "get_hotel_details"
+PARAMETERS = {"hotel_id": "1"}
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def measure(call, count):
+    """Return per-call latencies in microseconds"""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        result = call()
+        latencies.append((time.perf_counter() - started) * 1e6)
+        if not result.get("success"):
+            raise SystemExit(f"Tool call failed: {result}")
+    return latencies
+
+
+def report(label, latencies):
+    total = sum(latencies) / 1e6
+    print(f"  {label:<10} p50={percentile(latencies, 0.5):8.1f}us  p99={percentile(latencies, 0.99):8.1f}us  "
+          f"mean={sum(latencies) / len(latencies):8.1f}us  total={total:6.2f}s  ({len(latencies) / total:,.0f} calls/s)")
+
+
+def unpooled_call(url):
+    response = requests.post(f"{url}/agent/execute",
+                             json={"tool_name": TOOL_NAME, "parameters": PARAMETERS}, timeout=30)
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=HOTEL_AGENT_URL)
+    parser.add_argument("--calls", type=int, default=10_000, help="sequential tool calls per run")
+    parser.add_argument("--http2", action="store_true", help="also measure an HTTP/2 client")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"{args.calls:,} sequential {TOOL_NAME} calls against {args.url}")
+    print("=" * 70)
+    report("unpooled", measure(lambda: unpooled_call(args.url), args.calls))
+
+    client = A2AHotelClient(args.url, http2=False)
+    report("pooled", measure(lambda: client.call_tool(TOOL_NAME, PARAMETERS), args.calls))
+    client.close()
+
+    if args.http2:
+        client = A2AHotelClient(args.url, http2=True)
+        report("http2", measure(lambda: client.call_tool(TOOL_NAME, PARAMETERS), args.calls))
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+MessagePack Benchmark - reply size and decode time, application/msgpack vs application/json
+Run from the VacationPlanner directory (pip install msgpack): python benchmarks/bench_msgpack.py
+
+Builds catalogs of --hotels hotels and --flights flights, then encodes the
+replies the agents send for typical searches (a default page, a maximum page,
+an unpaged search and a batch) with the JSON codec in use and with msgpack.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flight_booking_agent  # noqa: E402
+import hotel_booking_agent  # noqa: E402
+from a2a_codec import CODECS, MSGPACK_MEDIA_TYPE, json_codec  # noqa: E402
+
+CITY = "Benchmark City"
+ORIGIN, DESTINATION = "Benchmark Origin", "Benchmark Destination"
+
+
+def build_catalogs(hotels, flights):
+    for i in range(hotels):
+        hotel_booking_agent.add_hotel({
+            "id": f"bench-{i}",
+            "name": f"Benchmark Hotel {i}",
+            "location": CITY,
+            "price_per_night": 80 + i % 400,
+            "available_rooms": 5 + i % 20,
+            "rating": 3.0 + (i % 20) / 10,
+            "amenities": ["WiFi", "Breakfast", "Pool", "Gym", "Parking"][:1 + i % 5]
+        })
+    for i in range(flights):
+        flight_booking_agent.add_flight({
+            "id": f"BM{i:05d}",
+            "airline": ["Benchmark Air", "CloudJet", "Luftansa"][i % 3],
+            "flight_number": f"BA{i}",
+            "origin": ORIGIN,
+            "destination": DESTINATION,
+            "departure_time": f"{i % 24:02d}:{i % 60:02d}",
+            "arrival_time": f"{(i + 7) % 24:02d}:{i % 60:02d}",
+            "price": 100 + i % 700,
+            "available_seats": 150,
+            "class": "Economy"
+        })
+
+
+def result_sets(flights):
+    hotel_agent = hotel_booking_agent.agent
+    flight_agent = flight_booking_agent.flight_agent
+    hotels = {"location": CITY, "sort_by": "price"}
+    route = {"origin": ORIGIN, "destination": DESTINATION}
+    return {
+        "search_hotels, 20 results": hotel_agent.execute_tool("search_hotels", dict(hotels, limit=20)),
+        "search_hotels, 100 results": hotel_agent.execute_tool("search_hotels", dict(hotels, limit=100)),
+        "search_flights, 20 results": flight_agent.execute_tool("search_flights", dict(route, limit=20)),
+        "search_flights, 100 results": flight_agent.execute_tool("search_flights", dict(route, limit=100)),
+        f"search_flights, all {flights}": flight_agent.execute_tool("search_flights", route),
+        "batch: hotels + flights, 20 each": {"results": [
+            hotel_agent.execute_tool("search_hotels", dict(hotels, limit=20)),
+            flight_agent.execute_tool("search_flights", dict(route, limit=20))
+        ]}
+    }
+
+
+def decode_ms(codec, encoded, repeat):
+    """Fastest of repeat decodes, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        codec.loads(encoded)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hotels", type=int, default=500)
+    parser.add_argument("--flights", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200, help="decodes per measurement (best is reported)")
+    args = parser.parse_args()
+
+    msgpack_codec = CODECS.get(MSGPACK_MEDIA_TYPE)
+    if msgpack_codec is None:
+        raise SystemExit("msgpack is not installed (or A2A_MSGPACK=0)")
+
+    build_catalogs(args.hotels, args.flights)
+    print(f"JSON codec: {json_codec.name}\n")
+    print(f"  {'result set':<34} {'json':>10} {'msgpack':>10} {'size':>7}   {'json':>8} {'msgpack':>8} {'decode':>7}")
+    for label, reply in result_sets(args.flights).items():
+        json_body, msgpack_body = json_codec.dumps(reply), msgpack_codec.dumps(reply)
+        assert msgpack_codec.loads(msgpack_body) == json_codec.loads(json_body)
+        json_ms = decode_ms(json_codec, json_body, args.repeat)
+        msgpack_ms = decode_ms(msgpack_codec, msgpack_body, args.repeat)
+        print(f"  {label:<34} {len(json_body):>9,}B {len(msgpack_body):>9,}B {1 - len(msgpack_body) / len(json_body):>7.0%}"
+              f"   {json_ms:>6.3f}ms {msgpack_ms:>6.3f}ms {1 - msgpack_ms / json_ms:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
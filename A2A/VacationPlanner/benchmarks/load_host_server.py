@@ -0,0 +1,182 @@
+"""
+Host Server Load Test - concurrent WebSocket sessions against host_server.py
+Start the hotel and flight agents first, then run from the VacationPlanner directory:
+python benchmarks/load_host_server.py [--sessions 1000] [--turns 5] [--model-latency 0.5]
+
+Launches the host server in a child process with a simulated model: every
+turn makes one generate_content call that asks for search_hotels and
+search_flights (real A2A calls to the running agents) and a second one that
+answers in text, each after --model-latency seconds. A failed tool call is
+reported back in that answer and counted as a tool error. Each session sends
+--turns messages with --think-time seconds between them.
+
+"sessions per core" is the number of concurrent sessions one fully busy
+host core would carry at this pace: sessions / (server CPU seconds / wall seconds).
+Use --url to load an already running server (with the real model) instead.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+import websockets
+
+VACATION_PLANNER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, VACATION_PLANNER)
+
+CITIES = ["Chicago", "Mumbai", "Bangalore", "Frankfurt", "Miami"]
+TOOL_ERROR_PREFIX = "Tool error"
+
+
+class SimulatedModels:
+    """Stands in for client.aio.models: a tool-calling turn, then a text answer"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def generate_content(self, model, contents, config):
+        from google.genai import types
+
+        await asyncio.sleep(self.latency)
+        last = contents[-1]
+        if last.role == "user" and last.parts[0].text:
+            _, origin, _, destination = last.parts[0].text.rsplit(" ", 3)
+            content = types.Content(role="model", parts=[
+                types.Part(function_call=types.FunctionCall(name="search_hotels", args={"location": destination})),
+                types.Part(function_call=types.FunctionCall(name="search_flights",
+                                                            args={"origin": origin, "destination": destination}))
+            ])
+        else:
+            failed = [f"{part.function_response.name}: {part.function_response.response['error']}"
+                      for part in last.parts
+                      if part.function_response and "error" in (part.function_response.response or {})]
+            text = (f"{TOOL_ERROR_PREFIX}s: {'; '.join(failed)}" if failed
+                    else f"Here are the options ({len(contents)} messages so far).")
+            content = types.Content(role="model", parts=[types.Part(text=text)])
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=content)])
+
+
+class SimulatedClient:
+    def __init__(self, latency):
+        self.aio = type("Aio", (), {})()
+        self.aio.models = SimulatedModels(latency)
+
+
+def serve(port, model_latency):
+    """Child process: the host server with the simulated model, output silenced"""
+    import uvicorn
+
+    from host_server import create_app
+
+    sys.stdout = open(os.devnull, "w")
+    uvicorn.run(create_app(genai_client=SimulatedClient(model_latency)),
+                host="127.0.0.1", port=port, log_level="warning", ws_max_size=1 << 20)
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+async def run_session(url, turns, think_time, latencies, errors, tool_errors):
+    async with websockets.connect(f"{url.replace('http', 'ws', 1)}/ws", open_timeout=60) as socket:
+        for turn in range(turns):
+            await asyncio.sleep(random.uniform(0, think_time * 2))
+            started = time.perf_counter()
+            origin, destination = random.sample(CITIES, 2)
+            await socket.send(json.dumps({"message": f"Plan a trip from {origin} to {destination}"}))
+            reply = json.loads(await socket.recv())
+            latencies.append(time.perf_counter() - started)
+            if "reply" not in reply:
+                errors.append(reply.get("error"))
+            elif reply["reply"].startswith(TOOL_ERROR_PREFIX):
+                tool_errors.append(reply["reply"])
+
+
+async def wait_until_up(url):
+    import httpx
+
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"Host server at {url} did not start")
+
+
+async def run_load(url, sessions, turns, think_time, ramp):
+    latencies, errors, tool_errors = [], [], []
+
+    async def start_session(number):
+        await asyncio.sleep(ramp * number / sessions)
+        try:
+            await run_session(url, turns, think_time, latencies, errors, tool_errors)
+        except (OSError, websockets.WebSocketException) as e:
+            errors.append(str(e))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(start_session(number) for number in range(sessions)))
+    return time.perf_counter() - started, latencies, errors, tool_errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000, help="concurrent WebSocket sessions")
+    parser.add_argument("--turns", type=int, default=5, help="messages per session")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean pause between a session's messages")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which sessions connect")
+    parser.add_argument("--model-latency", type=float, default=0.5, help="simulated seconds per model call")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--url", help="load an already running host server instead of launching one")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.model_latency)
+        return
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port),
+                                   "--model-latency", str(args.model_latency)], cwd=VACATION_PLANNER)
+    try:
+        asyncio.run(wait_until_up(url))
+        wall, latencies, errors, tool_errors = asyncio.run(run_load(url, args.sessions, args.turns, args.think_time, args.ramp))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print("=" * 70)
+    print(f"{args.sessions:,} sessions x {args.turns} turns against {url}")
+    print("=" * 70)
+    print(f"  wall time:     {wall:8.2f}s")
+    print(f"  turns:         {len(latencies):8,} ({len(latencies) / wall:,.1f}/s), errors: {len(errors)}, "
+          f"tool errors: {len(tool_errors)}")
+    if latencies:
+        print(f"  turn latency:  p50={percentile(latencies, 0.5) * 1000:8.1f}ms  "
+              f"p99={percentile(latencies, 0.99) * 1000:8.1f}ms")
+    if server is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = usage.ru_utime + usage.ru_stime
+        print(f"  server CPU:    {cpu:8.2f}s ({cpu / wall:.0%} of one core, "
+              f"{cpu / max(len(latencies), 1) * 1000:.2f}ms per turn)")
+        print(f"  sessions/core: {args.sessions / (cpu / wall):8,.0f}")
+    if errors:
+        print(f"  first error:   {errors[0]}")
+    if tool_errors:
+        print(f"  first tool error: {tool_errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
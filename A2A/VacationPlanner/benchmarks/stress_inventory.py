@@ -0,0 +1,132 @@
+"""
+Inventory Stress Test - concurrent bookings against both remote agents
+Run from the VacationPlanner directory: python benchmarks/stress_inventory.py
+
+Many threads book the same hotel and flight at once (with a tiny switch
+interval to force interleaving) and the run fails if any inventory is
+oversold or any booking ID is handed out twice.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flight_booking_agent  # noqa: E402
+import hotel_booking_agent  # noqa: E402
+
+
+def run_concurrently(num_threads, attempts, action):
+    """Run action(thread_index, attempt) from many threads; return (successes, failures)"""
+    successes = []
+    failures = []
+    start = threading.Barrier(num_threads)
+
+    def worker(index):
+        start.wait()
+        for attempt in range(attempts):
+            try:
+                successes.append(action(index, attempt))
+            except ValueError as e:
+                failures.append(str(e))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return successes, failures
+
+
+def stress_hotels(num_threads, attempts):
+    agent = hotel_booking_agent.agent
+    hotel_id = "1"
+    capacity = hotel_booking_agent.HOTELS[hotel_id]["available_rooms"]
+    check_in = date.today() + timedelta(days=30)
+    check_out = check_in + timedelta(days=2)
+
+    def book(index, attempt):
+        booking = agent.create_booking(hotel_id, f"Guest {index}-{attempt}",
+                                       check_in.isoformat(), check_out.isoformat(), 1)
+        return booking["booking_id"]
+
+    started = time.perf_counter()
+    booked, rejected = run_concurrently(num_threads, attempts, book)
+    elapsed = time.perf_counter() - started
+
+    confirmed = [b for b in hotel_booking_agent.bookings.values()
+                 if b["hotel_id"] == hotel_id and b["status"] == "confirmed"]
+    remaining = hotel_booking_agent.room_availability.rooms_left(hotel_id, capacity, check_in, check_out)
+
+    print(f"Hotel {hotel_id}: capacity={capacity} attempts={num_threads * attempts} "
+          f"booked={len(booked)} rejected={len(rejected)} remaining={remaining} ({elapsed:.3f}s)")
+
+    errors = []
+    if len(booked) != len(set(booked)):
+        errors.append("duplicate hotel booking IDs")
+    if len(confirmed) > capacity or remaining < 0:
+        errors.append("hotel rooms oversold")
+    if len(confirmed) + remaining != capacity:
+        errors.append("hotel room count drifted")
+    return errors
+
+
+def stress_flights(num_threads, attempts):
+    agent = flight_booking_agent.flight_agent
+    flight_id = "FL001"
+    capacity = flight_booking_agent.FLIGHTS[flight_id]["available_seats"]
+    travel_date = date.today() + timedelta(days=30)
+
+    def book(index, attempt):
+        booking = agent.book_flight(flight_id, f"Passenger {index}-{attempt}", travel_date.isoformat(),
+                                    1 + attempt % 2, "stress@example.com")
+        return booking["booking_reference"]
+
+    started = time.perf_counter()
+    booked, rejected = run_concurrently(num_threads, attempts, book)
+    elapsed = time.perf_counter() - started
+
+    seats_sold = sum(b["num_passengers"] for b in flight_booking_agent.flight_bookings.values()
+                     if b["flight_id"] == flight_id and b["status"] == "confirmed")
+    remaining = flight_booking_agent.seat_inventory.seats_left(flight_id, capacity, travel_date)
+
+    print(f"Flight {flight_id}: capacity={capacity} attempts={num_threads * attempts} "
+          f"booked={len(booked)} rejected={len(rejected)} remaining={remaining} ({elapsed:.3f}s)")
+
+    errors = []
+    if len(booked) != len(set(booked)):
+        errors.append("duplicate flight booking references")
+    if seats_sold > capacity or remaining < 0:
+        errors.append("flight seats oversold")
+    if seats_sold + remaining != capacity:
+        errors.append("flight seat count drifted")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--attempts", type=int, default=20, help="bookings attempted per thread")
+    args = parser.parse_args()
+
+    # Switch threads as often as possible to surface check-then-act races
+    sys.setswitchinterval(1e-6)
+
+    print("=" * 70)
+    print("Inventory stress test")
+    print("=" * 70)
+    errors = stress_hotels(args.threads, args.attempts) + stress_flights(args.threads, args.attempts)
+
+    if errors:
+        for error in errors:
+            print(f"✗ {error}")
+        sys.exit(1)
+    print("✓ No oversold inventory and no duplicate booking IDs")
+
+
+if __name__ == "__main__":
+    main()
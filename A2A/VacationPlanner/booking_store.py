@@ -0,0 +1,345 @@
+"""
+Booking Store - pluggable storage for hotel and flight bookings
+Memory (default) or durable: append-only write-ahead log with group commit and snapshots
+
+Select a store with open_booking_store(spec):
+  "memory"           plain in-process dict, lost on restart
+  "wal:/some/dir"       write-ahead log + snapshots in /some/dir; a write returns before its
+                        group is fsynced, so up to one sync interval of bookings can be lost on a crash
+  "wal+sync:/some/dir"  same log, but a write returns only once its group is fsynced (durable)
+"""
+
+import atexit
+import json
+import os
+import pickle
+import threading
+import time
+from itertools import islice
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+SNAPSHOT_PREFIX = "snapshot-"
+SEGMENT_PREFIX = "wal-"
+SNAPSHOT_CHUNK = 10000
+LOCK_NAME = "LOCK"
+
+
+def lock_exclusive(path):
+    """Open path and hold an exclusive lock on it for the life of the process (or until closed)
+
+    Availability is rebuilt from the stored bookings in each process, so only
+    one process may own a store at a time. A second one - e.g. the new worker
+    of a graceful reload - waits here until the first has exited.
+    """
+    lock_file = open(path, "a")
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print(f"Waiting for another process to release {path}...")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
+
+def _fsync_directory(directory):
+    """Make files created, renamed or removed in directory survive a power loss"""
+    if os.name == "nt":
+        return  # directories cannot be opened for fsync on Windows
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _encode(record):
+    return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+class MemoryBookingStore(dict):
+    """Default store: bookings in a plain dict, lost on restart"""
+
+    def close(self):
+        pass
+
+
+class WalBookingStore:
+    """Durable booking store: dict-like, backed by a write-ahead log
+
+    Every write is appended to the current log segment as one JSON line.
+    A background thread commits pending writes in groups - one write and one
+    fsync per batch - so a booking only pays for an in-memory append, but the
+    writes of the last sync_interval are lost on a crash (asynchronous commit).
+    With sync_commit=True a write waits for its batch to reach disk instead.
+    If writing or fsyncing the log fails, the store stops taking writes:
+    they raise RuntimeError, as do writers still waiting for the failed batch.
+
+    Every snapshot_every writes the full state is written to a snapshot in a
+    separate thread and the log rolls over to a new segment; older segments
+    are deleted once the snapshot is on disk. Snapshots are pickled in chunks
+    so loading them is fast and writing them never holds the GIL for long. Recovery loads the latest
+    snapshot and replays only the segments written after it.
+    """
+
+    def __init__(self, directory, sync_interval=0.005, snapshot_every=100000, sync_commit=False):
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self.sync_commit = sync_commit
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = lock_exclusive(os.path.join(directory, LOCK_NAME))
+
+        self._data = {}
+        self._seq = 0
+        self._io_lock = threading.Lock()  # held while writing or rolling the log segment
+        self._lock = threading.Lock()
+        self._pending_changed = threading.Condition(self._lock)
+        self._flushed = threading.Condition(threading.Lock())
+        self._pending = []
+        self._flushed_seq = 0
+        self._since_snapshot = 0
+        self._snapshot_thread = None
+        self._closed = False
+        self._error = None  # why the log stopped taking writes
+
+        self._recover()
+        self._segment = open(self._segment_path(self._seq + 1), "ab")
+        _fsync_directory(directory)
+        self._flushed_seq = self._seq
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+        self._flusher.start()
+
+    # Dict-like interface used by the agents
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def values(self):
+        return list(self._data.values())
+
+    def __setitem__(self, key, value):
+        """Store a booking and append it to the log"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Booking store is closed")
+            self._check_log()
+            self._seq += 1
+            seq = self._seq
+            previous = self._data.get(key)
+            self._data[key] = value
+            self._pending.append(_encode({"seq": seq, "key": key, "value": value}))
+            self._pending_changed.notify()
+
+        if self.sync_commit and not self._wait_flushed(seq):
+            with self._lock:
+                # Not durable, so not stored: undo it unless a later write replaced it
+                if self._data.get(key) is value:
+                    if previous is None:
+                        del self._data[key]
+                    else:
+                        self._data[key] = previous
+            self._check_log()
+
+    def _check_log(self):
+        if self._error is not None:
+            raise RuntimeError(f"Booking log write failed: {self._error}")
+
+    def _wait_flushed(self, seq):
+        """Wait until seq is on disk; False if the log failed first"""
+        with self._flushed:
+            while self._flushed_seq < seq and self._error is None:
+                self._flushed.wait()
+            return self._flushed_seq >= seq
+
+    # Group commit
+
+    def _flush_loop(self):
+        try:
+            self._commit_groups()
+        except Exception as e:
+            # The log is missing a batch now: refuse further writes and wake
+            # everyone waiting for a commit that will never happen
+            print(f"⚠ Booking log write failed in {self.directory}, no longer accepting writes: {e}")
+            with self._lock:
+                self._error = e
+                self._pending = []
+            with self._flushed:
+                self._flushed.notify_all()
+
+    def _commit_groups(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._pending_changed.wait()
+                if not self._pending and self._closed:
+                    return
+
+            with self._io_lock:
+                with self._lock:
+                    batch, self._pending = self._pending, []
+                    seq = self._seq
+                    self._since_snapshot += len(batch)
+                    snapshot_due = self._since_snapshot >= self.snapshot_every
+
+                if batch:
+                    self._segment.write(b"".join(batch))
+                    self._segment.flush()
+                    os.fsync(self._segment.fileno())
+
+            with self._flushed:
+                self._flushed_seq = seq
+                self._flushed.notify_all()
+
+            if snapshot_due and not self._snapshot_running():
+                self._start_snapshot()
+
+            if not self.sync_commit:
+                # Let writes accumulate into the next group
+                time.sleep(self.sync_interval)
+
+    def flush(self):
+        """Block until every write so far is on disk; raises RuntimeError if the log failed"""
+        with self._lock:
+            seq = self._seq
+            self._pending_changed.notify()
+        if not self._wait_flushed(seq):
+            self._check_log()
+
+    # Snapshots
+
+    def _snapshot_running(self):
+        return self._snapshot_thread is not None and self._snapshot_thread.is_alive()
+
+    def _start_snapshot(self):
+        # Roll the log at a point where everything up to seq is in the old segments
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                seq = self._seq
+                state = dict(self._data)
+                self._since_snapshot = 0
+            self._segment.write(b"".join(batch))
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            self._segment.close()
+            self._segment = open(self._segment_path(seq + 1), "ab")
+            _fsync_directory(self.directory)
+
+        with self._flushed:
+            self._flushed_seq = seq
+            self._flushed.notify_all()
+
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot, args=(seq, state), name="wal-snapshot", daemon=True)
+        self._snapshot_thread.start()
+
+    def snapshot(self):
+        """Write a snapshot now and wait for it to finish"""
+        if self._snapshot_running():
+            self._snapshot_thread.join()
+        self._start_snapshot()
+        self._snapshot_thread.join()
+
+    def _write_snapshot(self, seq, state):
+        path = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{seq:012d}.pickle")
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as snapshot:
+            pickle.dump({"seq": seq, "count": len(state)}, snapshot, pickle.HIGHEST_PROTOCOL)
+            items = iter(state.items())
+            while True:
+                chunk = list(islice(items, SNAPSHOT_CHUNK))
+                if not chunk:
+                    break
+                pickle.dump(chunk, snapshot, pickle.HIGHEST_PROTOCOL)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temp_path, path)
+        # The rename must be on disk before anything it replaces is removed
+        _fsync_directory(self.directory)
+
+        # The snapshot covers every segment that starts at or before seq
+        for name in os.listdir(self.directory):
+            if name.startswith(SNAPSHOT_PREFIX) and name < os.path.basename(path) \
+                    or name.startswith(SEGMENT_PREFIX) and self._segment_start(name) <= seq:
+                os.remove(os.path.join(self.directory, name))
+
+    # Recovery
+
+    def _segment_path(self, first_seq):
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{first_seq:012d}.log")
+
+    @staticmethod
+    def _segment_start(name):
+        return int(name[len(SEGMENT_PREFIX):-len(".log")])
+
+    def _recover(self):
+        names = sorted(os.listdir(self.directory))
+        snapshots = [n for n in names if n.startswith(SNAPSHOT_PREFIX) and n.endswith(".pickle")]
+        segments = [n for n in names if n.startswith(SEGMENT_PREFIX) and n.endswith(".log")]
+
+        if snapshots:
+            with open(os.path.join(self.directory, snapshots[-1]), "rb") as snapshot:
+                header = pickle.load(snapshot)
+                while len(self._data) < header["count"]:
+                    self._data.update(pickle.load(snapshot))
+            self._seq = header["seq"]
+
+        # Replay only what was logged after the snapshot
+        for name in segments:
+            path = os.path.join(self.directory, name)
+            valid_bytes = 0
+            with open(path, "rb") as segment:
+                for line in segment:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn write at the tail of the log
+                    valid_bytes += len(line)
+                    if record["seq"] > self._seq:
+                        self._data[record["key"]] = record["value"]
+                        self._seq = record["seq"]
+            if valid_bytes < os.path.getsize(path):
+                with open(path, "r+b") as segment:
+                    segment.truncate(valid_bytes)
+
+    def close(self):
+        """Commit outstanding writes and stop the background threads"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending_changed.notify()
+        self._flusher.join()
+        if self._snapshot_running():
+            self._snapshot_thread.join()
+        self._segment.close()
+        self._lock_file.close()
+
+
+def open_booking_store(spec=None):
+    """Create a booking store from a spec string ("memory", "wal:<directory>" or "wal+sync:<directory>")"""
+    if not spec or spec == "memory":
+        return MemoryBookingStore()
+    kind, _, location = spec.partition(":")
+    if kind in ("wal", "wal+sync") and location:
+        store = WalBookingStore(location, sync_commit=kind == "wal+sync")
+        atexit.register(store.close)
+        return store
+    raise ValueError(f"Unknown booking store: {spec}")
@@ -0,0 +1,91 @@
+"""
+Capabilities Cache - on-disk cache of remote agents' /agent/capabilities documents
+Used by the host agents so a restart does not need a discovery round trip per agent
+
+  A2A_CAPABILITIES_CACHE      cache directory (default ~/.cache/a2a-capabilities; "off" disables it)
+
+An entry is fresh for the max-age the agent sent in Cache-Control. Once it
+expires the host revalidates with If-None-Match and keeps the cached copy on
+304 Not Modified.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+
+CACHE_DIR = os.environ.get("A2A_CAPABILITIES_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "a2a-capabilities"))
+DEFAULT_TTL = 60
+
+
+def max_age(headers, default=DEFAULT_TTL):
+    """Seconds a response may be reused, from its Cache-Control header"""
+    cache_control = headers.get("Cache-Control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else default
+
+
+class CapabilitiesCache:
+    """One JSON file per agent URL holding its capabilities, ETag and expiry time"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or CACHE_DIR
+        self.enabled = self.directory != "off"
+
+    def _path(self, agent_url):
+        return os.path.join(self.directory, hashlib.sha1(agent_url.encode()).hexdigest() + ".json")
+
+    def load(self, agent_url):
+        """Cached entry for an agent ({"capabilities", "etag", "expires_at"}), or None"""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(agent_url)) as cached:
+                entry = json.load(cached)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("agent_url") == agent_url else None
+
+    @staticmethod
+    def is_fresh(entry):
+        return entry is not None and entry["expires_at"] > time.time()
+
+    def store(self, agent_url, capabilities, etag, ttl):
+        """Save a capabilities document; returns the new entry"""
+        entry = {
+            "agent_url": agent_url,
+            "capabilities": capabilities,
+            "etag": etag,
+            "expires_at": time.time() + ttl
+        }
+        if self.enabled:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                temp_path = self._path(agent_url) + f".{os.getpid()}.tmp"
+                with open(temp_path, "w") as cached:
+                    json.dump(entry, cached)
+                os.replace(temp_path, self._path(agent_url))
+            except OSError as e:
+                print(f"⚠ Could not write capabilities cache: {e}")
+        return entry
+
+    def revalidate(self, agent_url, entry, response):
+        """Update the cache from a discovery response; returns the capabilities to use, or None
+
+        response is the reply to a request sent with conditional_headers(entry).
+        """
+        if response.status_code == 304 and entry is not None:
+            return self.store(agent_url, entry["capabilities"], entry["etag"], max_age(response.headers))["capabilities"]
+        if response.status_code == 200:
+            capabilities = response.json()
+            self.store(agent_url, capabilities, response.headers.get("ETag"), max_age(response.headers))
+            return capabilities
+        return None
+
+    @staticmethod
+    def conditional_headers(entry):
+        """If-None-Match header for revalidating a cached entry"""
+        return {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
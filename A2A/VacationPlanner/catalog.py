@@ -0,0 +1,75 @@
+"""
+Catalogs - default in-memory storage for the hotel and flight inventories
+The SQLite backend (sqlite_backend.py) implements the same interface
+"""
+
+import threading
+
+from search_index import LocationIndex, RouteIndex
+
+
+class MemoryHotelCatalog:
+    """Hotels held in a dict, with a location index for searches"""
+
+    def __init__(self, hotels):
+        self._hotels = hotels
+        self._ids = list(hotels)  # catalog order; append-only, so searches can iterate it while hotels are added
+        self._add_lock = threading.Lock()
+        self._locations = LocationIndex("location")
+        for hotel_id, hotel in hotels.items():
+            self._locations.add(hotel_id, hotel)
+
+    def get(self, hotel_id):
+        """Return a hotel by ID, or None"""
+        return self._hotels.get(hotel_id)
+
+    def add(self, hotel):
+        """Add a hotel, or replace an existing one"""
+        with self._add_lock:
+            new = hotel["id"] not in self._hotels
+            self._hotels[hotel["id"]] = hotel
+            if new:
+                self._ids.append(hotel["id"])
+        self._locations.add(hotel["id"], hotel)
+
+    def search(self, location=None, max_price=None, min_rating=None):
+        """Yield hotels matching the location substring, price and rating, in catalog order"""
+        if location:
+            candidates = (self._hotels[hotel_id] for hotel_id in self._locations.lookup(location))
+        else:
+            candidates = (self._hotels[hotel_id] for hotel_id in self._ids)
+
+        for hotel in candidates:
+            if max_price and hotel["price_per_night"] > max_price:
+                continue
+            if min_rating and hotel["rating"] < min_rating:
+                continue
+            yield hotel
+
+
+class MemoryFlightCatalog:
+    """Flights held in a dict, with a price-sorted route index for searches"""
+
+    def __init__(self, flights):
+        self._flights = flights
+        self._routes = RouteIndex()
+        for flight_id, flight in flights.items():
+            self._routes.refresh(flight_id, flight)
+
+    def get(self, flight_id):
+        """Return a flight by ID, or None"""
+        return self._flights.get(flight_id)
+
+    def all(self):
+        """Return every scheduled flight"""
+        return list(self._flights.values())
+
+    def add(self, flight):
+        """Add a flight, or replace an existing one"""
+        self._flights[flight["id"]] = flight
+        self._routes.refresh(flight["id"], flight)
+
+    def search(self, origin=None, destination=None, max_price=None):
+        """Yield flights matching the route substrings and price, cheapest first"""
+        for flight_id in self._routes.lookup(origin, destination, max_price):
+            yield self._flights[flight_id]
@@ -0,0 +1,172 @@
+"""
+Chat History - keeps the conversation sent to the model within a token budget
+Used by travel_host_agent.py and travel_host_agent_async.py before every turn
+
+  A2A_HISTORY_TOKEN_BUDGET    estimated tokens of history to send (default 8000)
+  A2A_HISTORY_KEEP_TURNS      most recent turns always kept verbatim (default 4)
+
+Older turns are compacted in two steps: their tool responses are collapsed
+into digests (counts plus the identifying fields of the first few items),
+then, while the history is still over budget, the oldest turns are dropped
+and replaced by a one-line-per-turn summary at the start of the history.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from google.genai import types
+
+TOKEN_BUDGET = int(os.environ.get("A2A_HISTORY_TOKEN_BUDGET", "8000"))
+KEEP_TURNS = int(os.environ.get("A2A_HISTORY_KEEP_TURNS", "4"))
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+CHARS_PER_TOKEN = 4
+DIGEST_ITEMS = 5
+MAX_SUMMARY_LINES = 40
+
+# Fields kept for each item of a collapsed list: enough to refer back to it
+KEY_FIELDS = ("id", "hotel_id", "flight_id", "booking_id", "name", "hotel_name", "airline",
+              "flight_number", "location", "origin", "destination", "travel_date", "check_in",
+              "check_out", "price", "price_per_night", "total_price", "total_cost", "rating", "status")
+
+CompactionReport = namedtuple("CompactionReport", "tokens_before tokens_after dropped_turns")
+
+
+def estimate_tokens(content):
+    """Rough token count of one Content (about four characters per token)"""
+    return len(content.model_dump_json(exclude_none=True)) // CHARS_PER_TOKEN
+
+
+def _is_turn_start(content):
+    """A turn starts with a user message that carries text rather than tool responses"""
+    return content.role == "user" and any(part.text for part in content.parts or [])
+
+
+def _split_turns(chat_history):
+    turns = []
+    for content in chat_history:
+        if _is_turn_start(content) or not turns:
+            turns.append([])
+        turns[-1].append(content)
+    return turns
+
+
+def digest_value(value):
+    """Shrink a tool result: long lists keep their count and the key fields of a few items"""
+    if isinstance(value, dict):
+        return {key: digest_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [digest_value(item) for item in value[:DIGEST_ITEMS]]
+        items = [{key: item[key] for key in KEY_FIELDS if key in item} if isinstance(item, dict) else item
+                 for item in items]
+        if len(value) > DIGEST_ITEMS:
+            items.append(f"... {len(value) - DIGEST_ITEMS} more")
+        return items
+    return value
+
+
+def _digest_content(content):
+    """Copy of a tool-response Content with every payload digested"""
+    parts = []
+    changed = False
+    for part in content.parts or []:
+        response = part.function_response
+        if response is not None and not (response.response or {}).get("_digest"):
+            part = types.Part.from_function_response(
+                name=response.name,
+                response=dict(digest_value(response.response or {}), _digest=True)
+            )
+            changed = True
+        parts.append(part)
+    return types.Content(role=content.role, parts=parts) if changed else content
+
+
+def _brief(value, limit):
+    text = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"), default=str)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def summarize_turn(turn):
+    """One summary line for a dropped turn: the request, tools called and the reply"""
+    pieces = []
+    for content in turn:
+        for part in content.parts or []:
+            if part.text and part.text.startswith(SUMMARY_PREFIX):
+                continue
+            if part.text:
+                speaker = "User" if content.role == "user" else "Agent"
+                pieces.append(f"{speaker}: {_brief(part.text, 200)}")
+            elif part.function_call:
+                pieces.append(f"called {part.function_call.name}({_brief(part.function_call.args or {}, 120)})")
+            elif part.function_response:
+                response = part.function_response.response or {}
+                pieces.append(f"-> {_brief(response.get('error') or digest_value(response), 160)}")
+    return " | ".join(pieces)
+
+
+def _summary_lines(content):
+    """Summary lines carried by the first message of the history, if it has any"""
+    for part in content.parts or []:
+        if part.text and part.text.startswith(SUMMARY_PREFIX):
+            return part.text[len(SUMMARY_PREFIX):].splitlines()
+    return []
+
+
+class HistoryManager:
+    """Compacts chat_history in place so each model call stays within token_budget
+
+    The last keep_turns turns (the current one included) are never changed.
+    """
+
+    def __init__(self, token_budget=None, keep_turns=None):
+        self.token_budget = token_budget or TOKEN_BUDGET
+        self.keep_turns = keep_turns or KEEP_TURNS
+
+    def compact(self, chat_history):
+        """Shrink chat_history in place; returns a CompactionReport"""
+        sizes = {id(content): estimate_tokens(content) for content in chat_history}
+        tokens_before = sum(sizes.values())
+        if tokens_before <= self.token_budget:
+            return CompactionReport(tokens_before, tokens_before, 0)
+
+        turns = _split_turns(chat_history)
+        old, recent = turns[:-self.keep_turns], turns[-self.keep_turns:]
+
+        # Step 1: collapse tool payloads of older turns
+        old = [[_digest_content(content) for content in turn] for turn in old]
+        for turn in old:
+            for content in turn:
+                if id(content) not in sizes:
+                    sizes[id(content)] = estimate_tokens(content)
+
+        def total():
+            summary_tokens = sum(len(line) + 1 for line in summary) // CHARS_PER_TOKEN if dropped else 0
+            return summary_tokens + sum(sizes[id(content)] for turn in old + recent for content in turn)
+
+        # Step 2: drop the oldest turns into the summary until within budget
+        summary = _summary_lines(turns[0][0])
+        dropped = 0
+        while old and total() > self.token_budget:
+            turn = old.pop(0)
+            summary.append(summarize_turn(turn))
+            summary = summary[-MAX_SUMMARY_LINES:]
+            dropped += 1
+
+        kept = [content for turn in old + recent for content in turn]
+        if dropped:
+            first = kept[0]
+            parts = [part for part in first.parts if not (part.text and part.text.startswith(SUMMARY_PREFIX))]
+            kept[0] = types.Content(role=first.role, parts=[types.Part(text=SUMMARY_PREFIX + "\n".join(summary))] + parts)
+            sizes[id(kept[0])] = estimate_tokens(kept[0])
+
+        chat_history[:] = kept
+        return CompactionReport(tokens_before, sum(sizes[id(content)] for content in kept), dropped)
+
+    def prepare(self, chat_history):
+        """Compact before a model call and report the tokens saved"""
+        report = self.compact(chat_history)
+        if report.tokens_after < report.tokens_before:
+            print(f"[History] {report.tokens_before} -> {report.tokens_after} tokens "
+                  f"(saved {report.tokens_before - report.tokens_after}, dropped {report.dropped_turns} turns)")
+        return report
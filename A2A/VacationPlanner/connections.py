@@ -0,0 +1,162 @@
+"""
+Connection Search - multi-leg itineraries over the flight network
+Used by flight_booking_agent.py for the search_connections tool
+"""
+
+import heapq
+from collections import namedtuple
+
+from search_index import LocationIndex, normalize
+
+MINUTES_PER_DAY = 24 * 60
+
+Leg = namedtuple("Leg", ["price", "seq", "flight_id", "destination", "departure", "duration", "seats"])
+
+
+def parse_minutes(hhmm):
+    """Convert an HH:MM time of day into minutes after midnight"""
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+class FlightGraph:
+    """Adjacency structure over daily scheduled flights
+
+    Legs are grouped by origin and destination city and kept sorted by price.
+    Seats sold are not stored here; searches check them through an
+    is_bookable(leg, day_offset) callback, where day_offset counts days
+    after the first departure, so the graph only changes with the schedule.
+    """
+
+    def __init__(self):
+        self._seq = 0
+        self._legs = {}      # flight_id -> (origin, Leg)
+        self._edges = {}     # origin -> destination -> [Leg] sorted by price
+        self.origins = LocationIndex("origin")
+        self.destinations = LocationIndex("destination")
+
+    def add(self, flight_id, flight):
+        """Add a flight to the graph, or update it after a schedule change"""
+        self.remove(flight_id)
+        departure = parse_minutes(flight["departure_time"])
+        duration = (parse_minutes(flight["arrival_time"]) - departure) % MINUTES_PER_DAY
+        origin = normalize(flight["origin"])
+        leg = Leg(flight["price"], self._seq, flight_id, normalize(flight["destination"]),
+                  departure, duration or MINUTES_PER_DAY, flight["available_seats"])
+        self._seq += 1
+
+        legs = self._edges.setdefault(origin, {}).setdefault(leg.destination, [])
+        legs.append(leg)
+        legs.sort()
+        self._legs[flight_id] = (origin, leg)
+        self.origins.add(flight_id, flight)
+        self.destinations.add(flight_id, flight)
+
+    def remove(self, flight_id):
+        """Drop a flight from the graph"""
+        if flight_id not in self._legs:
+            return
+        origin, leg = self._legs.pop(flight_id)
+        by_destination = self._edges[origin]
+        by_destination[leg.destination].remove(leg)
+        if not by_destination[leg.destination]:
+            del by_destination[leg.destination]
+            if not by_destination:
+                del self._edges[origin]
+        self.origins.remove(flight_id)
+        self.destinations.remove(flight_id)
+
+    def search(self, origin, destination, is_bookable, sort_by="price", max_stops=2,
+               min_layover=60, max_results=5):
+        """Return up to max_results itineraries from origin to destination, best first
+
+        Runs a best-first (Dijkstra-style) search over partial itineraries,
+        ordered by total price or total elapsed minutes. Each city is settled
+        at most max_results times per leg count, which bounds the work to the
+        k-shortest itineraries instead of enumerating every path. Flights run
+        daily, so a connection departs on the first day that leaves at least
+        min_layover minutes after the previous arrival.
+        """
+        if sort_by not in ("price", "duration"):
+            raise ValueError("sort_by must be 'price' or 'duration'")
+
+        starts = self.origins.match_keys(origin)
+        targets = self.destinations.match_keys(destination)
+        if not starts or not targets:
+            return []
+
+        heap = []
+        counter = 0
+        for start in starts:
+            heapq.heappush(heap, ((0, 0), counter, start, None, 0, 0, (), (start,)))
+            counter += 1
+
+        settled = {}
+        itineraries = []
+        while heap and len(itineraries) < max_results:
+            cost, _, city, arrival, price, elapsed, path, cities = heapq.heappop(heap)
+
+            if path and city in targets:
+                itineraries.append({
+                    "flight_ids": [leg.flight_id for leg in path],
+                    "total_price": price,
+                    "total_duration_minutes": elapsed,
+                    "layover_minutes": [
+                        departs - arrives for arrives, departs in _layovers(path, min_layover)
+                    ],
+                })
+                continue
+
+            state = (city, len(path))
+            if settled.get(state, 0) >= max_results:
+                continue
+            settled[state] = settled.get(state, 0) + 1
+
+            by_destination = self._edges.get(city)
+            if not by_destination or len(path) > max_stops:
+                continue
+
+            if len(path) == max_stops:
+                # Last allowed leg must land on a target city
+                candidates = ((key, by_destination[key]) for key in targets if key in by_destination)
+            else:
+                candidates = by_destination.items()
+
+            depth = len(path) + 1
+            for next_city, legs in candidates:
+                if next_city in cities or settled.get((next_city, depth), 0) >= max_results:
+                    continue
+                # Price ordering only ever needs the k cheapest legs of a route
+                taken = 0
+                for leg in legs:
+                    if sort_by == "price" and taken >= max_results:
+                        break
+                    if arrival is None:
+                        departs = leg.departure
+                        new_elapsed = leg.duration
+                    else:
+                        ready = arrival + min_layover
+                        departs = ready + (leg.departure - ready) % MINUTES_PER_DAY
+                        new_elapsed = elapsed + (departs - arrival) + leg.duration
+
+                    if not is_bookable(leg, departs // MINUTES_PER_DAY):
+                        continue
+                    taken += 1
+                    new_price = price + leg.price
+                    new_cost = (new_price, new_elapsed) if sort_by == "price" else (new_elapsed, new_price)
+
+                    heapq.heappush(heap, (new_cost, counter, next_city, departs + leg.duration,
+                                          new_price, new_elapsed, path + (leg,), cities + (next_city,)))
+                    counter += 1
+
+        return itineraries
+
+
+def _layovers(path, min_layover):
+    """Yield (arrival, next departure) minute pairs at each connection of a path"""
+    arrival = path[0].departure + path[0].duration
+    for leg in path[1:]:
+        ready = arrival + min_layover
+        departs = ready + (leg.departure - ready) % MINUTES_PER_DAY
+        yield arrival, departs
+        arrival = departs + leg.duration
@@ -3,11 +3,29 @@ Flight Booking Agent - A2A Compliant Remote Service using Google ADK
 Run this alongside hotel_booking_agent.py: python flight_booking_agent.py
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request
+from werkzeug.serving import WSGIRequestHandler
 from datetime import datetime, timedelta
+import hashlib
 import json
+import os
+import time
+
+from availability import SeatInventory, parse_date
+from booking_store import open_booking_store
+from catalog import MemoryFlightCatalog
+from connections import FlightGraph
+from a2a_codec import CodecError, make_response, read_request
+from agent_logging import get_logger, log_batch, log_execute
+from agent_tools import AgentToolRegistry
+from inventory import IdSequence, LockStripes
+from pagination import MAX_LIMIT, check_sort_by, decode_cursor, page_size, paginate
 
 app = Flask(__name__)
+logger = get_logger("FlightBookingAgent")
+
+# How long clients may reuse /agent/capabilities without revalidating
+CAPABILITIES_MAX_AGE = int(os.environ.get("AGENT_CAPABILITIES_MAX_AGE", "300"))
 
 # Mock flight database
 FLIGHTS = {
@@ -85,112 +103,55 @@ FLIGHTS = {
     }
 }
 
-# Mock flight bookings storage
-flight_bookings = {}
-flight_booking_counter = 5000
-
-
-# Google ADK Tool Definitions for Flight Agent
-FLIGHT_TOOL_DEFINITIONS = [
-    {
-        "name": "search_flights",
-        "description": "Search for available flights based on origin, destination, date, and price criteria",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "origin": {
-                    "type": "string",
-                    "description": "Departure city"
-                },
-                "destination": {
-                    "type": "string",
-                    "description": "Arrival city"
-                },
-                "travel_date": {
-                    "type": "string",
-                    "description": "Travel date in YYYY-MM-DD format"
-                },
-                "max_price": {
-                    "type": "number",
-                    "description": "Maximum ticket price in USD"
-                }
-            },
-            "required": ["origin", "destination"]
-        }
-    },
-    {
-        "name": "get_flight_details",
-        "description": "Get detailed information about a specific flight",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "flight_id": {
-                    "type": "string",
-                    "description": "The unique identifier of the flight"
-                }
-            },
-            "required": ["flight_id"]
-        }
-    },
-    {
-        "name": "book_flight",
-        "description": "Book a flight ticket for a passenger",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "flight_id": {
-                    "type": "string",
-                    "description": "The flight ID to book"
-                },
-                "passenger_name": {
-                    "type": "string",
-                    "description": "Name of the passenger"
-                },
-                "travel_date": {
-                    "type": "string",
-                    "description": "Travel date in YYYY-MM-DD format"
-                },
-                "num_passengers": {
-                    "type": "integer",
-                    "description": "Number of passengers"
-                },
-                "passenger_email": {
-                    "type": "string",
-                    "description": "Email address for booking confirmation"
-                }
-            },
-            "required": ["flight_id", "passenger_name", "travel_date", "num_passengers", "passenger_email"]
-        }
-    },
-    {
-        "name": "get_flight_booking_status",
-        "description": "Check the status of an existing flight booking",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "booking_reference": {
-                    "type": "string",
-                    "description": "The flight booking reference number"
-                }
-            },
-            "required": ["booking_reference"]
-        }
-    },
-    {
-        "name": "cancel_flight_booking",
-        "description": "Cancel an existing flight booking",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "booking_reference": {
-                    "type": "string",
-                    "description": "The flight booking reference number to cancel"
-                }
-            },
-            "required": ["booking_reference"]
-        }
-    }
-]
+# Storage backend - FLIGHTS and in-memory bookings by default (FLIGHT_BOOKING_STORE=wal:<dir> or
+# wal+sync:<dir> for a log on disk), or FLIGHT_BACKEND=sqlite:<file> for both catalog and bookings in SQLite
+_backend = os.environ.get("FLIGHT_BACKEND", "memory")
+if _backend.startswith("sqlite:"):
+    from sqlite_backend import SQLiteBookingStore, SQLiteDatabase, SQLiteFlightCatalog
+    database = SQLiteDatabase(_backend[len("sqlite:"):])
+    flight_catalog = SQLiteFlightCatalog(database, seed=FLIGHTS)
+    flight_bookings = SQLiteBookingStore(database, "flight_bookings")
+elif _backend == "memory":
+    flight_catalog = MemoryFlightCatalog(FLIGHTS)
+    flight_bookings = open_booking_store(os.environ.get("FLIGHT_BOOKING_STORE"))
+else:
+    raise ValueError(f"Unknown FLIGHT_BACKEND: {_backend}")
+
+# Connection graph over the schedule - only changes when flights are added or changed
+flight_graph = FlightGraph()
+for _flight in flight_catalog.all():
+    flight_graph.add(_flight["id"], _flight)
+
+
+def add_flight(flight):
+    """Add a flight to the catalog, or replace an existing one, keeping the graph in sync"""
+    flight_catalog.add(flight)
+    flight_graph.add(flight["id"], flight)
+
+
+flight_booking_ids = IdSequence("FLT", 5000)
+flight_booking_ids.resume(flight_bookings)
+
+# Per-flight locks serializing seat check-then-reserve
+seat_locks = LockStripes()
+
+# Seats sold per flight per date; a flight's "available_seats" is its seat count
+seat_inventory = SeatInventory()
+for _booking in flight_bookings.values():
+    if _booking["status"] == "confirmed":
+        seat_inventory.restore(_booking["flight_id"], parse_date(_booking["travel_date"]),
+                               _booking["num_passengers"])
+
+
+# Sort keys for search_flights; the flight ID breaks ties so every key is unique
+FLIGHT_SORT_KEYS = {
+    "price": lambda flight: (flight["price"], flight["flight_id"]),
+    "departure_time": lambda flight: (flight["departure_time"], flight["flight_id"])
+}
+
+
+# Tool registry - the agent's tool methods register themselves with @flight_tools.tool
+flight_tools = AgentToolRegistry()
 
 
 class FlightBookingAgent:
@@ -199,6 +160,7 @@ class FlightBookingAgent:
     def __init__(self):
         self.name = "FlightBookingAgent"
         self.version = "1.0"
+        self._capabilities_document = None
         self.tools = FLIGHT_TOOL_DEFINITIONS
     
     def get_capabilities(self):
@@ -208,62 +170,159 @@ class FlightBookingAgent:
             "version": self.version,
             "tools": self.tools,
             "status": "online",
-            "protocol": "google-adk-a2a"
+            "protocol": "google-adk-a2a",
+            "supports_batch": True
         }
     
-    def search_flights(self, origin, destination, travel_date=None, max_price=None):
-        """Search for available flights"""
-        results = []
+    def capabilities_document(self):
+        """Serialized capabilities and their ETag, built once since the tools never change at runtime"""
+        if self._capabilities_document is None:
+            body = json.dumps(self.get_capabilities(), sort_keys=True).encode()
+            self._capabilities_document = (body, hashlib.sha256(body).hexdigest()[:32])
+        return self._capabilities_document
+    
+    @flight_tools.tool(
+        "Search for available flights based on origin, destination, date, and price criteria",
+        origin={"type": "string", "description": "Departure city"},
+        destination={"type": "string", "description": "Arrival city"},
+        travel_date={"type": "string", "description": "Travel date in YYYY-MM-DD format"},
+        max_price={"type": "number", "description": "Maximum ticket price in USD"},
+        sort_by={"type": "string", "enum": ["price", "departure_time"], "description": "Order results by lowest price (default) or earliest departure"},
+        limit={"type": "integer", "minimum": 1, "maximum": MAX_LIMIT, "description": "Maximum number of flights to return (1-100); the response has a next_cursor if more match"},
+        cursor={"type": "string", "description": "next_cursor from a previous search with the same criteria, to get the next page"}
+    )
+    def search_flights(self, origin, destination, travel_date=None, max_price=None,
+                       sort_by=None, limit=None, cursor=None):
+        """Search for available flights, cheapest first, optionally sorted and paged"""
+        check_sort_by(sort_by, FLIGHT_SORT_KEYS)
+        sort_key = FLIGHT_SORT_KEYS.get(sort_by)
+        search_date = parse_date(travel_date) if travel_date else None
         
-        for flight_id, flight in FLIGHTS.items():
-            match = True
-            
-            if origin and origin.lower() not in flight["origin"].lower():
-                match = False
-            if destination and destination.lower() not in flight["destination"].lower():
-                match = False
-            if max_price and flight["price"] > max_price:
-                match = False
-            
-            if match and flight["available_seats"] > 0:
-                results.append({
-                    "flight_id": flight["id"],
-                    "airline": flight["airline"],
-                    "flight_number": flight["flight_number"],
-                    "origin": flight["origin"],
-                    "destination": flight["destination"],
-                    "departure_time": flight["departure_time"],
-                    "arrival_time": flight["arrival_time"],
-                    "price": flight["price"],
-                    "available_seats": flight["available_seats"],
-                    "class": flight["class"]
-                })
+        paged = limit is not None or cursor is not None
+        presorted = sort_by == "price" and hasattr(flight_catalog, "search_by_price")
+        if presorted:
+            # SQLite reads price order off its index, starting after the cursor;
+            # without a date no rows are filtered out below, so LIMIT is exact
+            after = decode_cursor(cursor, sort_by) if cursor else None
+            fetch = page_size(limit) + 1 if paged and search_date is None else None
+            flights = flight_catalog.search_by_price(origin, destination, max_price, after, fetch)
+        else:
+            flights = flight_catalog.search(origin, destination, max_price)
         
-        return {
+        def matches():
+            # (sort key, result) pairs, produced lazily so only one page is ever kept
+            for position, flight in enumerate(flights):
+                if search_date is None:
+                    result = self._flight_summary(flight)
+                else:
+                    seats_left = seat_inventory.seats_left(flight["id"], flight["available_seats"], search_date)
+                    if seats_left <= 0:
+                        continue
+                    result = self._flight_summary(flight, seats_left)
+                yield (sort_key(result) if sort_key else (position,)), result
+        
+        results, next_cursor = paginate(matches(), sort_by, limit, cursor, presorted)
+        response = {
             "count": len(results),
             "flights": results,
             "travel_date": travel_date or "Not specified"
         }
+        if next_cursor:
+            response["next_cursor"] = next_cursor
+        return response
+    
+    @flight_tools.tool(
+        "Search for itineraries with connecting flights when no direct flight fits, ranked by total price or total travel time",
+        origin={"type": "string", "description": "Departure city"},
+        destination={"type": "string", "description": "Arrival city"},
+        travel_date={"type": "string", "description": "Travel date in YYYY-MM-DD format"},
+        sort_by={"type": "string", "enum": ["price", "duration"], "description": "Rank itineraries by total price or total travel time (default: price)"},
+        max_stops={"type": "integer", "minimum": 0, "description": "Maximum number of connections (default: 2)"},
+        min_layover_minutes={"type": "integer", "minimum": 0, "description": "Minimum time between connecting flights in minutes (default: 60)"},
+        max_results={"type": "integer", "minimum": 1, "description": "Maximum number of itineraries to return (default: 5)"}
+    )
+    def search_connections(self, origin, destination, travel_date=None, sort_by="price",
+                           max_stops=2, min_layover_minutes=60, max_results=5):
+        """Search for multi-leg itineraries, including direct flights"""
+        search_date = parse_date(travel_date) if travel_date else None
+        
+        def is_bookable(leg, day_offset):
+            if search_date is None:
+                return leg.seats > 0
+            try:
+                return seat_inventory.seats_left(leg.flight_id, leg.seats,
+                                                 search_date + timedelta(days=day_offset)) > 0
+            except ValueError:
+                return False
+        
+        itineraries = flight_graph.search(
+            origin, destination,
+            is_bookable=is_bookable,
+            sort_by=sort_by,
+            max_stops=min(int(max_stops), 3),
+            min_layover=int(min_layover_minutes),
+            max_results=min(int(max_results), 20)
+        )
+        
+        results = []
+        for itinerary in itineraries:
+            legs = [self._flight_summary(flight_catalog.get(flight_id)) for flight_id in itinerary["flight_ids"]]
+            results.append({
+                "stops": len(legs) - 1,
+                "total_price": itinerary["total_price"],
+                "total_duration_minutes": itinerary["total_duration_minutes"],
+                "layover_minutes": itinerary["layover_minutes"],
+                "flights": legs
+            })
+        
+        return {
+            "count": len(results),
+            "itineraries": results,
+            "sort_by": sort_by,
+            "travel_date": travel_date or "Not specified"
+        }
+    
+    def _flight_summary(self, flight, seats_left=None):
+        """Flight fields returned by the search tools"""
+        return {
+            "flight_id": flight["id"],
+            "airline": flight["airline"],
+            "flight_number": flight["flight_number"],
+            "origin": flight["origin"],
+            "destination": flight["destination"],
+            "departure_time": flight["departure_time"],
+            "arrival_time": flight["arrival_time"],
+            "price": flight["price"],
+            "available_seats": flight["available_seats"] if seats_left is None else seats_left,
+            "class": flight["class"]
+        }
     
+    @flight_tools.tool(
+        "Get detailed information about a specific flight",
+        flight_id={"type": "string", "description": "The unique identifier of the flight"}
+    )
     def get_flight_details(self, flight_id):
         """Get detailed information about a specific flight"""
-        if flight_id not in FLIGHTS:
+        flight = flight_catalog.get(flight_id)
+        if flight is None:
             raise ValueError(f"Flight with ID {flight_id} not found")
         
-        return FLIGHTS[flight_id]
+        return flight
     
+    @flight_tools.tool(
+        "Book a flight ticket for a passenger",
+        flight_id={"type": "string", "description": "The flight ID to book"},
+        passenger_name={"type": "string", "description": "Name of the passenger"},
+        travel_date={"type": "string", "description": "Travel date in YYYY-MM-DD format"},
+        num_passengers={"type": "integer", "minimum": 1, "description": "Number of passengers"},
+        passenger_email={"type": "string", "description": "Email address for booking confirmation"}
+    )
     def book_flight(self, flight_id, passenger_name, travel_date, num_passengers, passenger_email):
         """Book a flight"""
-        global flight_booking_counter
-        
-        if flight_id not in FLIGHTS:
+        flight = flight_catalog.get(flight_id)
+        if flight is None:
             raise ValueError(f"Flight with ID {flight_id} not found")
         
-        flight = FLIGHTS[flight_id]
-        
-        if flight["available_seats"] < num_passengers:
-            raise ValueError(f"Not enough seats available. Only {flight['available_seats']} seats left")
-        
         # Validate date
         try:
             booking_date = datetime.strptime(travel_date, "%Y-%m-%d")
@@ -274,11 +333,14 @@ class FlightBookingAgent:
         
         total_cost = flight["price"] * num_passengers
         
+        # Reserve seats on the travel date, atomically with respect to other bookings of this flight
+        with seat_locks.lock(flight_id):
+            seat_inventory.reserve(flight_id, flight["available_seats"], booking_date.date(), num_passengers)
+        
         # Create booking
-        booking_reference = f"FLT{flight_booking_counter}"
-        flight_booking_counter += 1
+        booking_reference = flight_booking_ids.next_id()
         
-        flight_bookings[booking_reference] = {
+        booking = {
             "booking_reference": booking_reference,
             "flight_id": flight_id,
             "airline": flight["airline"],
@@ -296,12 +358,21 @@ class FlightBookingAgent:
             "status": "confirmed",
             "booked_at": datetime.now().isoformat()
         }
+        try:
+            flight_bookings[booking_reference] = booking
+        except Exception:
+            # The store did not take the booking (busy database, full disk,
+            # closed log): give the seats back instead of leaking them
+            with seat_locks.lock(flight_id):
+                seat_inventory.release(flight_id, booking_date.date(), num_passengers)
+            raise
         
-        # Update available seats
-        FLIGHTS[flight_id]["available_seats"] -= num_passengers
-        
-        return flight_bookings[booking_reference]
+        return booking
     
+    @flight_tools.tool(
+        "Check the status of an existing flight booking",
+        booking_reference={"type": "string", "description": "The flight booking reference number"}
+    )
     def get_flight_booking_status(self, booking_reference):
         """Get status of a flight booking"""
         if booking_reference not in flight_bookings:
@@ -309,40 +380,37 @@ class FlightBookingAgent:
         
         return flight_bookings[booking_reference]
     
+    @flight_tools.tool(
+        "Cancel an existing flight booking",
+        booking_reference={"type": "string", "description": "The flight booking reference number to cancel"}
+    )
     def cancel_flight_booking(self, booking_reference):
         """Cancel a flight booking"""
         if booking_reference not in flight_bookings:
             raise ValueError(f"Booking {booking_reference} not found")
         
-        booking = flight_bookings[booking_reference]
-        
-        if booking["status"] == "cancelled":
-            raise ValueError("Booking already cancelled")
+        flight_id = flight_bookings[booking_reference]["flight_id"]
         
-        # Update booking status
-        booking["status"] = "cancelled"
-        
-        # Restore seat availability
-        flight_id = booking["flight_id"]
-        FLIGHTS[flight_id]["available_seats"] += booking["num_passengers"]
+        with seat_locks.lock(flight_id):
+            # Re-read under the lock: stores like SQLite hand out copies, so a
+            # booking read before it may already have been cancelled meanwhile
+            booking = flight_bookings[booking_reference]
+            if booking["status"] == "cancelled":
+                raise ValueError("Booking already cancelled")
+            
+            # Update booking status
+            booking["status"] = "cancelled"
+            flight_bookings[booking_reference] = booking
+            
+            # Restore seat availability on the travel date
+            seat_inventory.release(flight_id, parse_date(booking["travel_date"]), booking["num_passengers"])
         
         return booking
     
     def execute_tool(self, tool_name, parameters):
         """Execute a tool and return result (ADK Format)"""
         try:
-            if tool_name == "search_flights":
-                result = self.search_flights(**parameters)
-            elif tool_name == "get_flight_details":
-                result = self.get_flight_details(**parameters)
-            elif tool_name == "book_flight":
-                result = self.book_flight(**parameters)
-            elif tool_name == "get_flight_booking_status":
-                result = self.get_flight_booking_status(**parameters)
-            elif tool_name == "cancel_flight_booking":
-                result = self.cancel_flight_booking(**parameters)
-            else:
-                raise ValueError(f"Unknown tool: {tool_name}")
+            result = flight_tools.dispatch(self, tool_name, parameters)
             
             return {
                 "success": True,
@@ -355,6 +423,10 @@ class FlightBookingAgent:
             }
 
 
+# Google ADK Tool Definitions, generated from the decorated methods
+FLIGHT_TOOL_DEFINITIONS = flight_tools.definitions
+
+
 # Initialize agent
 flight_agent = FlightBookingAgent()
 
@@ -362,35 +434,64 @@ flight_agent = FlightBookingAgent()
 # A2A API Endpoints (Google ADK Compatible)
 @app.route('/agent/capabilities', methods=['GET'])
 def capabilities():
-    """A2A Discovery endpoint - returns available tools in ADK format"""
-    return jsonify(flight_agent.get_capabilities())
+    """A2A Discovery endpoint - returns available tools in ADK format
+    
+    Cacheable for CAPABILITIES_MAX_AGE seconds; clients revalidate with If-None-Match.
+    """
+    body, etag = flight_agent.capabilities_document()
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = CAPABILITIES_MAX_AGE
+    # Answers 304 Not Modified when the client's ETag still matches
+    return response.make_conditional(request)
 
 
 @app.route('/agent/execute', methods=['POST'])
 def execute():
     """A2A Execute endpoint - ADK tool execution format"""
-    data = request.json
+    data = read_request(request)
+    if not isinstance(data, dict):
+        return make_response(app, request, {"success": False, "error": "Body must be an object with tool_name and parameters"}, 400)
     tool_name = data.get('tool_name')
     parameters = data.get('parameters', {})
     
+    started = time.perf_counter()
     result = flight_agent.execute_tool(tool_name, parameters)
+    log_execute(logger, tool_name, parameters, result, time.perf_counter() - started)
+    return make_response(app, request, result)
 
-    print("\n---------------------------------------------------------")
-    print(f"[FlightBookingAgent] Received A2A request:")
-    print(f"  Tool: {tool_name}")
-    print(f"  Parameters: {parameters}")
-    print("\nResult:")
-    print(result['result'])
-    print("---------------------------------------------------------\n")
-    
-    print(f"[FlightBookingAgent] Response: {'Success' if result['success'] else 'Error'}")
-    return jsonify(result)
+
+@app.route('/agent/execute_batch', methods=['POST'])
+def execute_batch():
+    """A2A Batch execute endpoint - runs several ADK tool calls, results in request order"""
+    data = read_request(request)
+    calls = data.get('calls') if isinstance(data, dict) else None
+    if not isinstance(calls, list):
+        return make_response(app, request, {"success": False, "error": "Body must contain a 'calls' list"}, 400)
+
+    started = time.perf_counter()
+    results = []
+    for call in calls:
+        if not isinstance(call, dict):
+            results.append({"success": False, "error": "Each call must be an object with tool_name and parameters"})
+            continue
+        results.append(flight_agent.execute_tool(call.get('tool_name'), call.get('parameters', {})))
+
+    log_batch(logger, calls, results, time.perf_counter() - started)
+    return make_response(app, request, {"results": results})
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "agent": flight_agent.name})
+    return make_response(app, request, {"status": "healthy", "agent": flight_agent.name})
+
+
+@app.errorhandler(CodecError)
+def codec_error(error):
+    """Request bodies that cannot be decoded (400) or use an unsupported Content-Type (415)"""
+    return make_response(app, request, {"success": False, "error": str(error)}, error.status)
 
 
 if __name__ == '__main__':
@@ -403,4 +504,6 @@ if __name__ == '__main__':
         print(f"  - {tool['name']}")
     print("\nStarting server on http://localhost:5001")
     print("="*70)
+    # Answer with HTTP/1.1 so the host's pooled connections stay open between calls
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
     app.run(host='0.0.0.0', port=5001, debug=True)
@@ -0,0 +1,25 @@
+"""
+Flight Booking Agent (asyncio) - the A2A flight service on an ASGI server
+Run instead of flight_booking_agent.py: python flight_booking_agent_async.py  (or uvicorn flight_booking_agent_async:app)
+
+FlightBookingAgent and its storage are shared with flight_booking_agent.py;
+only the HTTP layer is asynchronous (see agent_asgi.py).
+"""
+
+from agent_asgi import create_agent_app
+from flight_booking_agent import CAPABILITIES_MAX_AGE, flight_agent
+
+app = create_agent_app(flight_agent, CAPABILITIES_MAX_AGE)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("="*70)
+    print("Flight Booking Agent (A2A Remote Service - asyncio)")
+    print("="*70)
+    print(f"Agent: {flight_agent.name}")
+    print(f"Tools: {len(flight_agent.tools)}")
+    print("\nStarting server on http://localhost:5001")
+    print("="*70)
+    uvicorn.run(app, host='0.0.0.0', port=5001)
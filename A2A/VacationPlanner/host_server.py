@@ -0,0 +1,153 @@
+"""
+Host Server - the travel host agent as a multi-session HTTP/WebSocket service
+Run after starting the remote agents: python host_server.py  (or uvicorn host_server:app)
+
+Endpoints (port 8000):
+  POST   /chat                  {"message": ..., "session_id": optional} -> {"session_id", "reply"}
+                                (session IDs are issued by the server; unknown ones start a new session)
+  DELETE /sessions/<id>         end a conversation
+  WS     /ws?session_id=<id>    send {"message": ...}, receive {"session_id", "reply"} per turn
+  GET    /health
+
+All sessions share one genai client and one AsyncA2AClient per remote agent.
+Histories live in a bounded SessionStore with idle eviction:
+  HOST_MAX_SESSIONS (default 10000), HOST_SESSION_IDLE_SECONDS (default 1800)
+"""
+
+import asyncio
+import contextlib
+import os
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocketDisconnect
+
+from session_store import SessionStore
+from travel_host_agent_async import create_travel_agent, run_turn
+
+HOST_PORT = int(os.environ.get("HOST_PORT", "8000"))
+MAX_SESSIONS = int(os.environ.get("HOST_MAX_SESSIONS", "10000"))
+SESSION_IDLE_SECONDS = int(os.environ.get("HOST_SESSION_IDLE_SECONDS", "1800"))
+EVICTION_INTERVAL = 30
+
+
+async def _evict_idle_sessions(sessions):
+    while True:
+        await asyncio.sleep(EVICTION_INTERVAL)
+        dropped = sessions.evict_idle()
+        if dropped:
+            print(f"[Host Server] Evicted {dropped} idle sessions ({len(sessions)} active)")
+
+
+async def _converse(app, session, message):
+    """Run one turn of a session; turns of the same session never overlap"""
+    state = app.state
+    async with session.lock:
+        return await run_turn(state.client, state.hotel_client, state.flight_client, state.config,
+                              session.chat_history, message)
+
+
+async def chat(request):
+    """One conversation turn over plain HTTP"""
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    message = body.get("message") if isinstance(body, dict) else None
+    if not isinstance(message, str) or not message.strip():
+        return JSONResponse({"error": "Body must contain a 'message' string"}, status_code=400)
+
+    session = request.app.state.sessions.get_or_create(body.get("session_id"))
+    try:
+        reply = await _converse(request.app, session, message.strip())
+    except Exception as e:
+        return JSONResponse({"session_id": session.session_id, "error": str(e)}, status_code=502)
+    return JSONResponse({"session_id": session.session_id, "reply": reply})
+
+
+async def end_session(request):
+    """Forget a conversation"""
+    if not request.app.state.sessions.remove(request.path_params["session_id"]):
+        return JSONResponse({"error": "Unknown session"}, status_code=404)
+    return JSONResponse({"success": True})
+
+
+async def chat_socket(websocket):
+    """Conversation over a WebSocket; one session per connection"""
+    await websocket.accept()
+    sessions = websocket.app.state.sessions
+    session_id = sessions.get_or_create(websocket.query_params.get("session_id")).session_id
+    try:
+        while True:
+            try:
+                body = await websocket.receive_json()
+            except (ValueError, TypeError, KeyError):
+                # Not JSON text (or a binary frame): answer instead of dropping the connection
+                await websocket.send_json({"session_id": session_id, "error": "Messages must be JSON text"})
+                continue
+            message = body.get("message") if isinstance(body, dict) else None
+            if not isinstance(message, str) or not message.strip():
+                await websocket.send_json({"error": "Message must contain a 'message' string"})
+                continue
+            # Look the session up per turn: if it was evicted meanwhile a new one
+            # (with a new ID, returned in the reply) takes its place
+            session = sessions.get_or_create(session_id)
+            session_id = session.session_id
+            try:
+                reply = await _converse(websocket.app, session, message.strip())
+                await websocket.send_json({"session_id": session_id, "reply": reply})
+            except Exception as e:
+                await websocket.send_json({"session_id": session_id, "error": str(e)})
+    except WebSocketDisconnect:
+        pass
+
+
+async def health(request):
+    """Health check endpoint"""
+    sessions = request.app.state.sessions
+    return JSONResponse({"status": "healthy", "sessions": len(sessions), "evicted": sessions.evicted})
+
+
+def create_app(genai_client=None, max_sessions=None, idle_timeout=None):
+    """Build the host server; genai_client replaces the default client (e.g. in load tests)"""
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        client, hotel_client, flight_client, config = await create_travel_agent(genai_client)
+        if config is None:
+            raise RuntimeError("No tools discovered from remote agents")
+        state = app.state
+        state.client = client
+        state.hotel_client, state.flight_client, state.config = hotel_client, flight_client, config
+        state.sessions = SessionStore(max_sessions or MAX_SESSIONS, idle_timeout or SESSION_IDLE_SECONDS)
+        evictor = asyncio.create_task(_evict_idle_sessions(state.sessions))
+        try:
+            yield
+        finally:
+            evictor.cancel()
+            await asyncio.gather(hotel_client.close(), flight_client.close())
+
+    return Starlette(
+        routes=[
+            Route("/chat", chat, methods=["POST"]),
+            Route("/sessions/{session_id}", end_session, methods=["DELETE"]),
+            WebSocketRoute("/ws", chat_socket),
+            Route("/health", health, methods=["GET"])
+        ],
+        lifespan=lifespan
+    )
+
+
+app = create_app()
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("="*70)
+    print("Travel Host Server (multi-session HTTP/WebSocket)")
+    print("="*70)
+    print(f"\nStarting server on http://localhost:{HOST_PORT}")
+    print("="*70)
+    uvicorn.run(app, host='0.0.0.0', port=HOST_PORT)
@@ -3,11 +3,28 @@ Hotel Booking Agent - A2A Compliant Remote Service using Google ADK
 Run this first: python hotel_booking_agent.py
 """
 
-from flask import Flask, request, jsonify
-from datetime import datetime
+from flask import Flask, request
+from werkzeug.serving import WSGIRequestHandler
+from datetime import date, datetime
+import hashlib
 import json
+import os
+import time
+
+from availability import RoomAvailability, parse_date
+from booking_store import open_booking_store
+from catalog import MemoryHotelCatalog
+from a2a_codec import CodecError, make_response, read_request
+from agent_logging import get_logger, log_batch, log_execute
+from agent_tools import AgentToolRegistry
+from inventory import IdSequence, LockStripes
+from pagination import MAX_LIMIT, check_sort_by, decode_cursor, page_size, paginate
 
 app = Flask(__name__)
+logger = get_logger("HotelBookingAgent")
+
+# How long clients may reuse /agent/capabilities without revalidating
+CAPABILITIES_MAX_AGE = int(os.environ.get("AGENT_CAPABILITIES_MAX_AGE", "300"))
 
 # Mock hotel database
 HOTELS = {
@@ -58,107 +75,49 @@ HOTELS = {
     }
 }
 
-# Mock bookings storage
-bookings = {}
-booking_counter = 1000
-
-
-# Google ADK Tool Definitions
-TOOL_DEFINITIONS = [
-    {
-        "name": "search_hotels",
-        "description": "Search for available hotels based on location, price, and rating criteria",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "location": {
-                    "type": "string",
-                    "description": "City or location to search for hotels"
-                },
-                "max_price": {
-                    "type": "number",
-                    "description": "Maximum price per night in USD"
-                },
-                "min_rating": {
-                    "type": "number",
-                    "description": "Minimum hotel rating (0-5)"
-                }
-            }
-        }
-    },
-    {
-        "name": "get_hotel_details",
-        "description": "Get detailed information about a specific hotel",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "hotel_id": {
-                    "type": "string",
-                    "description": "The unique identifier of the hotel"
-                }
-            },
-            "required": ["hotel_id"]
-        }
-    },
-    {
-        "name": "create_booking",
-        "description": "Create a new hotel booking reservation",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "hotel_id": {
-                    "type": "string",
-                    "description": "The hotel ID to book"
-                },
-                "guest_name": {
-                    "type": "string",
-                    "description": "Name of the guest"
-                },
-                "check_in": {
-                    "type": "string",
-                    "description": "Check-in date in YYYY-MM-DD format"
-                },
-                "check_out": {
-                    "type": "string",
-                    "description": "Check-out date in YYYY-MM-DD format"
-                },
-                "num_guests": {
-                    "type": "integer",
-                    "description": "Number of guests"
-                }
-            },
-            "required": ["hotel_id", "guest_name", "check_in", "check_out", "num_guests"]
-        }
-    },
-    {
-        "name": "get_booking_status",
-        "description": "Check the status of an existing booking",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "booking_id": {
-                    "type": "string",
-                    "description": "The booking confirmation ID"
-                }
-            },
-            "required": ["booking_id"]
-        }
-    },
-    {
-        "name": "cancel_booking",
-        "description": "Cancel an existing hotel booking",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "booking_id": {
-                    "type": "string",
-                    "description": "The booking confirmation ID to cancel"
-                }
-            },
-            "required": ["booking_id"]
-        }
-    }
-]
+# Storage backend - HOTELS and in-memory bookings by default (HOTEL_BOOKING_STORE=wal:<dir> or
+# wal+sync:<dir> for a log on disk), or HOTEL_BACKEND=sqlite:<file> for both catalog and bookings in SQLite
+_backend = os.environ.get("HOTEL_BACKEND", "memory")
+if _backend.startswith("sqlite:"):
+    from sqlite_backend import SQLiteBookingStore, SQLiteDatabase, SQLiteHotelCatalog
+    database = SQLiteDatabase(_backend[len("sqlite:"):])
+    hotel_catalog = SQLiteHotelCatalog(database, seed=HOTELS)
+    bookings = SQLiteBookingStore(database, "hotel_bookings")
+elif _backend == "memory":
+    hotel_catalog = MemoryHotelCatalog(HOTELS)
+    bookings = open_booking_store(os.environ.get("HOTEL_BOOKING_STORE"))
+else:
+    raise ValueError(f"Unknown HOTEL_BACKEND: {_backend}")
+
+
+def add_hotel(hotel):
+    """Add a hotel to the catalog, or replace an existing one"""
+    hotel_catalog.add(hotel)
+
+
+booking_ids = IdSequence("BK", 1000)
+booking_ids.resume(bookings)
+
+# Per-hotel locks serializing room check-then-reserve
+room_locks = LockStripes()
+
+# Rooms booked per hotel per night; a hotel's "available_rooms" is its room count
+room_availability = RoomAvailability()
+for _booking in bookings.values():
+    if _booking["status"] == "confirmed":
+        room_availability.restore(_booking["hotel_id"], parse_date(_booking["check_in"]),
+                                  parse_date(_booking["check_out"]))
+
+
+# Sort keys for search_hotels; the hotel ID breaks ties so every key is unique
+HOTEL_SORT_KEYS = {
+    "price": lambda hotel: (hotel["price_per_night"], hotel["hotel_id"]),
+    "rating": lambda hotel: (-hotel["rating"], hotel["hotel_id"])
+}
+
+
+# Tool registry - the agent's tool methods register themselves with @hotel_tools.tool
+hotel_tools = AgentToolRegistry()
 
 
 class HotelBookingAgent:
@@ -167,6 +126,7 @@ class HotelBookingAgent:
     def __init__(self):
         self.name = "HotelBookingAgent"
         self.version = "1.0"
+        self._capabilities_document = None
         self.tools = TOOL_DEFINITIONS
     
     def get_capabilities(self):
@@ -176,64 +136,115 @@ class HotelBookingAgent:
             "version": self.version,
             "tools": self.tools,
             "status": "online",
-            "protocol": "google-adk-a2a"
+            "protocol": "google-adk-a2a",
+            "supports_batch": True
         }
     
-    def search_hotels(self, location=None, max_price=None, min_rating=None):
-        """Search for available hotels"""
-        results = []
+    def capabilities_document(self):
+        """Serialized capabilities and their ETag, built once since the tools never change at runtime"""
+        if self._capabilities_document is None:
+            body = json.dumps(self.get_capabilities(), sort_keys=True).encode()
+            self._capabilities_document = (body, hashlib.sha256(body).hexdigest()[:32])
+        return self._capabilities_document
+    
+    @hotel_tools.tool(
+        "Search for available hotels based on location, price, and rating criteria",
+        location={"type": "string", "description": "City or location to search for hotels"},
+        max_price={"type": "number", "description": "Maximum price per night in USD"},
+        min_rating={"type": "number", "description": "Minimum hotel rating (0-5)"},
+        check_in={"type": "string", "description": "Check-in date in YYYY-MM-DD format; with check_out, only hotels with rooms free on every night are returned"},
+        check_out={"type": "string", "description": "Check-out date in YYYY-MM-DD format"},
+        sort_by={"type": "string", "enum": ["price", "rating"], "description": "Order results by lowest price or highest rating (default: catalog order)"},
+        limit={"type": "integer", "minimum": 1, "maximum": MAX_LIMIT, "description": "Maximum number of hotels to return (1-100); the response has a next_cursor if more match"},
+        cursor={"type": "string", "description": "next_cursor from a previous search with the same criteria, to get the next page"}
+    )
+    def search_hotels(self, location=None, max_price=None, min_rating=None, check_in=None, check_out=None,
+                      sort_by=None, limit=None, cursor=None):
+        """Search for available hotels, optionally sorted and paged"""
+        check_sort_by(sort_by, HOTEL_SORT_KEYS)
+        sort_key = HOTEL_SORT_KEYS.get(sort_by)
         
-        for hotel_id, hotel in HOTELS.items():
-            match = True
-            
-            if location and location.lower() not in hotel["location"].lower():
-                match = False
-            if max_price and hotel["price_per_night"] > max_price:
-                match = False
-            if min_rating and hotel["rating"] < min_rating:
-                match = False
-            
-            if match and hotel["available_rooms"] > 0:
-                results.append({
-                    "hotel_id": hotel["id"],
-                    "name": hotel["name"],
-                    "location": hotel["location"],
-                    "price_per_night": hotel["price_per_night"],
-                    "available_rooms": hotel["available_rooms"],
-                    "rating": hotel["rating"],
-                    "amenities": hotel["amenities"]
-                })
+        if check_in or check_out:
+            if not (check_in and check_out):
+                raise ValueError("Both check_in and check_out are required to search by dates")
+            check_in_date = parse_date(check_in)
+            check_out_date = parse_date(check_out)
         
-        return {
+        paged = limit is not None or cursor is not None
+        presorted = sort_by == "price" and hasattr(hotel_catalog, "search_by_price")
+        if presorted:
+            # SQLite reads price order off its index, starting after the cursor;
+            # without dates no rows are filtered out below, so LIMIT is exact
+            after = decode_cursor(cursor, sort_by) if cursor else None
+            fetch = page_size(limit) + 1 if paged and not check_in else None
+            hotels = hotel_catalog.search_by_price(location, max_price, min_rating, after, fetch)
+        else:
+            hotels = hotel_catalog.search(location, max_price, min_rating)
+        
+        def matches():
+            # (sort key, result) pairs, produced lazily so only one page is ever kept
+            for position, hotel in enumerate(hotels):
+                if check_in:
+                    rooms_left = room_availability.rooms_left(hotel["id"], hotel["available_rooms"],
+                                                              check_in_date, check_out_date)
+                else:
+                    rooms_left = hotel["available_rooms"]
+                
+                if rooms_left > 0:
+                    result = {
+                        "hotel_id": hotel["id"],
+                        "name": hotel["name"],
+                        "location": hotel["location"],
+                        "price_per_night": hotel["price_per_night"],
+                        "available_rooms": rooms_left,
+                        "rating": hotel["rating"],
+                        "amenities": hotel["amenities"]
+                    }
+                    yield (sort_key(result) if sort_key else (position,)), result
+        
+        results, next_cursor = paginate(matches(), sort_by, limit, cursor, presorted)
+        response = {
             "count": len(results),
             "hotels": results
         }
+        if next_cursor:
+            response["next_cursor"] = next_cursor
+        return response
     
+    @hotel_tools.tool(
+        "Get detailed information about a specific hotel",
+        hotel_id={"type": "string", "description": "The unique identifier of the hotel"}
+    )
     def get_hotel_details(self, hotel_id):
         """Get detailed information about a specific hotel"""
-        if hotel_id not in HOTELS:
+        hotel = hotel_catalog.get(hotel_id)
+        if hotel is None:
             raise ValueError(f"Hotel with ID {hotel_id} not found")
         
-        return HOTELS[hotel_id]
+        return hotel
     
+    @hotel_tools.tool(
+        "Create a new hotel booking reservation",
+        hotel_id={"type": "string", "description": "The hotel ID to book"},
+        guest_name={"type": "string", "description": "Name of the guest"},
+        check_in={"type": "string", "description": "Check-in date in YYYY-MM-DD format"},
+        check_out={"type": "string", "description": "Check-out date in YYYY-MM-DD format"},
+        num_guests={"type": "integer", "minimum": 1, "description": "Number of guests"}
+    )
     def create_booking(self, hotel_id, guest_name, check_in, check_out, num_guests):
         """Create a new hotel booking"""
-        global booking_counter
-        
-        if hotel_id not in HOTELS:
+        hotel = hotel_catalog.get(hotel_id)
+        if hotel is None:
             raise ValueError(f"Hotel with ID {hotel_id} not found")
         
-        hotel = HOTELS[hotel_id]
-        
-        if hotel["available_rooms"] < 1:
-            raise ValueError("No rooms available")
-        
         # Calculate nights and total cost
         try:
-            check_in_date = datetime.strptime(check_in, "%Y-%m-%d")
-            check_out_date = datetime.strptime(check_out, "%Y-%m-%d")
+            check_in_date = parse_date(check_in)
+            check_out_date = parse_date(check_out)
             nights = (check_out_date - check_in_date).days
             
+            if check_in_date < date.today():
+                raise ValueError("Check-in date cannot be in the past")
             if nights <= 0:
                 raise ValueError("Check-out must be after check-in")
         except ValueError as e:
@@ -241,11 +252,14 @@ class HotelBookingAgent:
         
         total_cost = hotel["price_per_night"] * nights
         
+        # Reserve a room for every night, atomically with respect to other bookings of this hotel
+        with room_locks.lock(hotel_id):
+            room_availability.reserve(hotel_id, hotel["available_rooms"], check_in_date, check_out_date)
+        
         # Create booking
-        booking_id = f"BK{booking_counter}"
-        booking_counter += 1
+        booking_id = booking_ids.next_id()
         
-        bookings[booking_id] = {
+        booking = {
             "booking_id": booking_id,
             "hotel_id": hotel_id,
             "hotel_name": hotel["name"],
@@ -259,12 +273,21 @@ class HotelBookingAgent:
             "status": "confirmed",
             "created_at": datetime.now().isoformat()
         }
+        try:
+            bookings[booking_id] = booking
+        except Exception:
+            # The store did not take the booking (busy database, full disk,
+            # closed log): give the nights back instead of leaking them
+            with room_locks.lock(hotel_id):
+                room_availability.release(hotel_id, check_in_date, check_out_date)
+            raise
         
-        # Update available rooms
-        HOTELS[hotel_id]["available_rooms"] -= 1
-        
-        return bookings[booking_id]
+        return booking
     
+    @hotel_tools.tool(
+        "Check the status of an existing booking",
+        booking_id={"type": "string", "description": "The booking confirmation ID"}
+    )
     def get_booking_status(self, booking_id):
         """Get status of a booking"""
         if booking_id not in bookings:
@@ -272,40 +295,38 @@ class HotelBookingAgent:
         
         return bookings[booking_id]
     
+    @hotel_tools.tool(
+        "Cancel an existing hotel booking",
+        booking_id={"type": "string", "description": "The booking confirmation ID to cancel"}
+    )
     def cancel_booking(self, booking_id):
         """Cancel a booking"""
         if booking_id not in bookings:
             raise ValueError(f"Booking {booking_id} not found")
         
-        booking = bookings[booking_id]
-        
-        if booking["status"] == "cancelled":
-            raise ValueError("Booking already cancelled")
-        
-        # Update booking status
-        booking["status"] = "cancelled"
+        hotel_id = bookings[booking_id]["hotel_id"]
         
-        # Restore room availability
-        hotel_id = booking["hotel_id"]
-        HOTELS[hotel_id]["available_rooms"] += 1
+        with room_locks.lock(hotel_id):
+            # Re-read under the lock: stores like SQLite hand out copies, so a
+            # booking read before it may already have been cancelled meanwhile
+            booking = bookings[booking_id]
+            if booking["status"] == "cancelled":
+                raise ValueError("Booking already cancelled")
+            
+            # Update booking status
+            booking["status"] = "cancelled"
+            bookings[booking_id] = booking
+            
+            # Restore room availability for the booked nights
+            room_availability.release(hotel_id, parse_date(booking["check_in"]),
+                                      parse_date(booking["check_out"]))
         
         return booking
     
     def execute_tool(self, tool_name, parameters):
         """Execute a tool and return result (ADK Format)"""
         try:
-            if tool_name == "search_hotels":
-                result = self.search_hotels(**parameters)
-            elif tool_name == "get_hotel_details":
-                result = self.get_hotel_details(**parameters)
-            elif tool_name == "create_booking":
-                result = self.create_booking(**parameters)
-            elif tool_name == "get_booking_status":
-                result = self.get_booking_status(**parameters)
-            elif tool_name == "cancel_booking":
-                result = self.cancel_booking(**parameters)
-            else:
-                raise ValueError(f"Unknown tool: {tool_name}")
+            result = hotel_tools.dispatch(self, tool_name, parameters)
             
             return {
                 "success": True,
@@ -318,6 +339,10 @@ class HotelBookingAgent:
             }
 
 
+# Google ADK Tool Definitions, generated from the decorated methods
+TOOL_DEFINITIONS = hotel_tools.definitions
+
+
 # Initialize agent
 agent = HotelBookingAgent()
 
@@ -325,35 +350,64 @@ agent = HotelBookingAgent()
 # A2A API Endpoints (Google ADK Compatible)
 @app.route('/agent/capabilities', methods=['GET'])
 def capabilities():
-    """A2A Discovery endpoint - returns available tools in ADK format"""
-    return jsonify(agent.get_capabilities())
+    """A2A Discovery endpoint - returns available tools in ADK format
+    
+    Cacheable for CAPABILITIES_MAX_AGE seconds; clients revalidate with If-None-Match.
+    """
+    body, etag = agent.capabilities_document()
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = CAPABILITIES_MAX_AGE
+    # Answers 304 Not Modified when the client's ETag still matches
+    return response.make_conditional(request)
 
 
 @app.route('/agent/execute', methods=['POST'])
 def execute():
     """A2A Execute endpoint - ADK tool execution format"""
-    data = request.json
+    data = read_request(request)
+    if not isinstance(data, dict):
+        return make_response(app, request, {"success": False, "error": "Body must be an object with tool_name and parameters"}, 400)
     tool_name = data.get('tool_name')
     parameters = data.get('parameters', {})
 
+    started = time.perf_counter()
     result = agent.execute_tool(tool_name, parameters)
+    log_execute(logger, tool_name, parameters, result, time.perf_counter() - started)
+    return make_response(app, request, result)
+
 
-    print("\n---------------------------------------------------------")
-    print(f"[HotelBookingAgent] Received A2A request:")
-    print(f"  Tool: {tool_name}")
-    print(f"  Parameters: {parameters}")
-    print("\nResult:")
-    print(result['result'])
-    print("---------------------------------------------------------\n")
+@app.route('/agent/execute_batch', methods=['POST'])
+def execute_batch():
+    """A2A Batch execute endpoint - runs several ADK tool calls, results in request order"""
+    data = read_request(request)
+    calls = data.get('calls') if isinstance(data, dict) else None
+    if not isinstance(calls, list):
+        return make_response(app, request, {"success": False, "error": "Body must contain a 'calls' list"}, 400)
 
-    print(f"[HotelBookingAgent] Response: {'Success' if result['success'] else 'Error'}")
-    return jsonify(result)
+    started = time.perf_counter()
+    results = []
+    for call in calls:
+        if not isinstance(call, dict):
+            results.append({"success": False, "error": "Each call must be an object with tool_name and parameters"})
+            continue
+        results.append(agent.execute_tool(call.get('tool_name'), call.get('parameters', {})))
+
+    log_batch(logger, calls, results, time.perf_counter() - started)
+    return make_response(app, request, {"results": results})
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "agent": agent.name})
+    return make_response(app, request, {"status": "healthy", "agent": agent.name})
+
+
+@app.errorhandler(CodecError)
+def codec_error(error):
+    """Request bodies that cannot be decoded (400) or use an unsupported Content-Type (415)"""
+    return make_response(app, request, {"success": False, "error": str(error)}, error.status)
 
 
 if __name__ == '__main__':
@@ -366,4 +420,6 @@ if __name__ == '__main__':
         print(f"  - {tool['name']}")
     print("\nStarting server on http://localhost:5000")
     print("="*70)
+    # Answer with HTTP/1.1 so the host's pooled connections stay open between calls
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,25 @@
+"""
+Hotel Booking Agent (asyncio) - the A2A hotel service on an ASGI server
+Run instead of hotel_booking_agent.py: python hotel_booking_agent_async.py  (or uvicorn hotel_booking_agent_async:app)
+
+HotelBookingAgent and its storage are shared with hotel_booking_agent.py;
+only the HTTP layer is asynchronous (see agent_asgi.py).
+"""
+
+from agent_asgi import create_agent_app
+from hotel_booking_agent import CAPABILITIES_MAX_AGE, agent
+
+app = create_agent_app(agent, CAPABILITIES_MAX_AGE)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("="*70)
+    print("Hotel Booking Agent (A2A Remote Service - asyncio)")
+    print("="*70)
+    print(f"Agent: {agent.name}")
+    print(f"Tools: {len(agent.tools)}")
+    print("\nStarting server on http://localhost:5000")
+    print("="*70)
+    uvicorn.run(app, host='0.0.0.0', port=5000)
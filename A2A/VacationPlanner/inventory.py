@@ -0,0 +1,46 @@
+"""
+Inventory - concurrency primitives for room and seat reservations
+Shared by hotel_booking_agent.py and flight_booking_agent.py
+"""
+
+import threading
+import zlib
+
+
+class LockStripes:
+    """Fixed pool of locks; each inventory key (hotel ID, flight ID) maps to one
+
+    Bookings for different hotels or flights usually hold different locks and
+    proceed in parallel, while check-then-reserve on one key is serialized.
+    """
+
+    def __init__(self, stripes=64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def lock(self, key):
+        """Return the lock guarding the given inventory key"""
+        return self._locks[zlib.crc32(str(key).encode()) % len(self._locks)]
+
+
+class IdSequence:
+    """Thread-safe generator of prefixed booking IDs (BK1000, BK1001, ...)"""
+
+    def __init__(self, prefix, start):
+        self.prefix = prefix
+        self._next = start
+        self._lock = threading.Lock()
+
+    def next_id(self):
+        """Reserve and return the next ID"""
+        with self._lock:
+            value = self._next
+            self._next += 1
+        return f"{self.prefix}{value}"
+
+    def resume(self, existing_ids):
+        """Continue numbering after the highest of existing_ids (e.g. bookings recovered from disk)"""
+        with self._lock:
+            for booking_id in existing_ids:
+                suffix = booking_id[len(self.prefix):]
+                if booking_id.startswith(self.prefix) and suffix.isdigit():
+                    self._next = max(self._next, int(suffix) + 1)
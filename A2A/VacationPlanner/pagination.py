@@ -0,0 +1,81 @@
+"""
+Pagination - top-k selection and cursors for the search tools
+Shared by hotel_booking_agent.py and flight_booking_agent.py
+
+Results are paged by key (keyset pagination): each result has a sort key
+tuple ending in a unique value, and a cursor is the key of the last result
+returned. The next page is the `limit` smallest keys after the cursor,
+picked with a bounded heap, so a "cheapest 5" query never sorts or copies
+the full match set.
+"""
+
+import base64
+import heapq
+import json
+from itertools import islice
+from operator import itemgetter
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def encode_cursor(sort_by, key):
+    """Opaque cursor pointing after the result with the given sort key"""
+    data = json.dumps([sort_by, list(key)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort_by):
+    """Sort key a cursor points after; it must come from a search with the same sort_by"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort_by, key = json.loads(data)
+        if not all(isinstance(value, (str, int, float)) for value in key):
+            raise TypeError("Cursor keys are scalars")
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort_by != sort_by:
+        raise ValueError("Cursor was issued for a different sort_by")
+    return tuple(key)
+
+
+def check_sort_by(sort_by, allowed):
+    if sort_by is not None and sort_by not in allowed:
+        raise ValueError(f"sort_by must be one of: {', '.join(allowed)}")
+
+
+def page_size(limit):
+    """Results per page for a requested limit (DEFAULT_LIMIT when none is given)"""
+    if limit is None:
+        return DEFAULT_LIMIT
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    return int(limit)
+
+
+def paginate(keyed_results, sort_by=None, limit=None, cursor=None, presorted=False):
+    """Select one page from (sort key, result) pairs; returns (page, next_cursor)
+
+    Without limit and cursor every result is returned (sorted if sort_by is
+    set), as the search tools did before paging existed. presorted means the
+    pairs already arrive in ascending key order (e.g. from an ORDER BY), so
+    the page is read off the front instead of selected with a heap.
+    """
+    if limit is None and cursor is None:
+        if sort_by is None or presorted:
+            return [result for _, result in keyed_results], None
+        return [result for _, result in sorted(keyed_results, key=itemgetter(0))], None
+
+    limit = page_size(limit)
+    if cursor:
+        after = decode_cursor(cursor, sort_by)
+        keyed_results = (pair for pair in keyed_results if pair[0] > after)
+
+    if sort_by is None or presorted:
+        # Catalog order or presorted: the keys already arrive ascending
+        selected = list(islice(keyed_results, limit + 1))
+    else:
+        selected = heapq.nsmallest(limit + 1, keyed_results, key=itemgetter(0))
+
+    next_cursor = encode_cursor(sort_by, selected[limit - 1][0]) if len(selected) > limit else None
+    return [result for _, result in selected[:limit]], next_cursor
@@ -0,0 +1,111 @@
+"""
+Response Shaper - bounds the tool results the host feeds back to the model
+Used by travel_host_agent.py (and the asyncio host / host server through it)
+
+  A2A_TOOL_MAX_ITEMS      items of a result list passed to the model per page (default 10)
+  A2A_TOOL_PROJECTION=0   pass list items with all their fields instead of PROJECTIONS
+
+Lists longer than the cap are cut to one page; the rest is kept on the host
+under a continuation token, which the model can pass to the host-side
+get_more_results tool for the next page.
+"""
+
+import os
+import secrets
+import threading
+from collections import OrderedDict
+
+from google.genai import types
+
+MAX_ITEMS = int(os.environ.get("A2A_TOOL_MAX_ITEMS", "10"))
+PROJECT_FIELDS = os.environ.get("A2A_TOOL_PROJECTION", "1") != "0"
+
+# Fields the model gets for the items of each result list, by list key
+PROJECTIONS = {
+    "hotels": ("hotel_id", "name", "location", "price_per_night", "rating", "available_rooms"),
+    "flights": ("flight_id", "airline", "flight_number", "origin", "destination",
+                "departure_time", "arrival_time", "price", "available_seats")
+}
+
+MORE_RESULTS_TOOL = "get_more_results"
+
+MORE_RESULTS_DECLARATION = types.FunctionDeclaration(
+    name=MORE_RESULTS_TOOL,
+    description="Get the next page of a long search result. Pass the continuation_token "
+                "returned with the previous page.",
+    parameters={
+        "type": "object",
+        "properties": {
+            "continuation_token": {
+                "type": "string",
+                "description": "continuation_token from the previous page"
+            }
+        },
+        "required": ["continuation_token"]
+    }
+)
+
+
+class ResponseShaper:
+    """Caps result lists, projects their items and pages the remainder
+
+    Pending pages are kept for the max_pending most recent tokens.
+    """
+
+    def __init__(self, max_items=None, projections=None, max_pending=1024):
+        self.max_items = max_items or MAX_ITEMS
+        self.projections = (PROJECTIONS if PROJECT_FIELDS else {}) if projections is None else projections
+        self.max_pending = max_pending
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _project(self, key, items):
+        fields = self.projections.get(key)
+        return [self._project_item(item, fields) for item in items]
+
+    def _project_item(self, item, fields):
+        if not isinstance(item, dict):
+            return item
+        if fields:
+            item = {field: item[field] for field in fields if field in item}
+        # Nested lists (e.g. the flights of an itinerary) are projected too
+        return {key: self._project(key, value) if isinstance(value, list) else value
+                for key, value in item.items()}
+
+    def _page(self, key, items, offset):
+        """One page of items starting at offset, with a token for the rest if any"""
+        page = {key: self._project(key, items[offset:offset + self.max_items])}
+        if len(items) > self.max_items:
+            page["showing"] = f"{offset + 1}-{min(offset + self.max_items, len(items))} of {len(items)}"
+        if offset + self.max_items < len(items):
+            token = secrets.token_urlsafe(12)
+            with self._lock:
+                self._pending[token] = (key, items, offset + self.max_items)
+                while len(self._pending) > self.max_pending:
+                    self._pending.popitem(last=False)
+            page["continuation_token"] = token
+        return page
+
+    def shape(self, result):
+        """Bounded copy of a tool result: its list fields paged and projected"""
+        if not isinstance(result, dict):
+            return result
+        shaped = {}
+        for key, value in result.items():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                shaped.update(self._page(key, value, 0))
+            else:
+                shaped[key] = value
+        return shaped
+
+    def more(self, continuation_token):
+        """Result of the get_more_results tool: the next page for a continuation token"""
+        with self._lock:
+            pending = self._pending.pop(continuation_token, None)
+        if pending is None:
+            return {
+                "success": False,
+                "error": "Unknown or expired continuation_token; run the search again"
+            }
+        key, items, offset = pending
+        return {"success": True, "result": self._page(key, items, offset)}
@@ -0,0 +1,192 @@
+"""
+Search Indexes - in-memory lookup structures shared by the remote agents
+Keeps location searches proportional to the number of matches instead of the catalog size
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+
+
+def normalize(value):
+    """Normalize a location string for index keys and queries"""
+    return value.lower()
+
+
+class LocationIndex:
+    """Substring index over a location field of a record catalog
+
+    Every distinct normalized location is registered under all of its
+    substrings, so a query is a single dict hit that yields the matching
+    locations, and from there the matching record IDs. Results follow the
+    order in which records were first added, like iterating the catalog dict.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._order = {}       # record_id -> insertion sequence
+        self._keys = {}        # record_id -> normalized location
+        self._members = {}     # normalized location -> set of record IDs
+        self._substrings = {}  # substring -> set of normalized locations
+
+    def add(self, record_id, record):
+        """Index a new record, or re-index a record whose location changed"""
+        key = normalize(record[self.field])
+        with self._lock:
+            if record_id in self._keys:
+                if self._keys[record_id] == key:
+                    return
+                self._unlink(record_id)
+            else:
+                self._order[record_id] = self._seq
+                self._seq += 1
+
+            self._keys[record_id] = key
+            members = self._members.get(key)
+            if members is None:
+                members = self._members[key] = set()
+                for start in range(len(key)):
+                    for end in range(start + 1, len(key) + 1):
+                        self._substrings.setdefault(key[start:end], set()).add(key)
+            members.add(record_id)
+
+    def remove(self, record_id):
+        """Drop a record from the index"""
+        with self._lock:
+            if record_id in self._keys:
+                self._unlink(record_id)
+                del self._order[record_id]
+
+    def _unlink(self, record_id):
+        key = self._keys.pop(record_id)
+        members = self._members[key]
+        members.discard(record_id)
+        if members:
+            return
+
+        del self._members[key]
+        for start in range(len(key)):
+            for end in range(start + 1, len(key) + 1):
+                keys = self._substrings[key[start:end]]
+                keys.discard(key)
+                if not keys:
+                    del self._substrings[key[start:end]]
+
+    def match_keys(self, query):
+        """Return the normalized locations containing the query"""
+        with self._lock:
+            return set(self._substrings.get(normalize(query), ()))
+
+    def lookup(self, query):
+        """Return IDs of records whose location contains the query, in catalog order"""
+        matches = []
+        with self._lock:
+            for key in self._substrings.get(normalize(query), ()):
+                matches.extend(self._members[key])
+            matches.sort(key=self._order.__getitem__)
+        return matches
+
+
+class RouteIndex:
+    """(origin, destination) route index with each route's flights sorted by price
+
+    Only bookable flights (available seats > 0) are indexed; call refresh()
+    whenever a flight's seats or price change. Origin and destination queries
+    keep substring semantics through a LocationIndex on each side. Updates
+    and lookups are serialized by an internal lock, so bookings on different
+    flights can refresh the index concurrently.
+    """
+
+    def __init__(self, origin_field="origin", destination_field="destination",
+                 price_field="price", seats_field="available_seats"):
+        self._lock = threading.Lock()
+        self.price_field = price_field
+        self.seats_field = seats_field
+        self.origins = LocationIndex(origin_field)
+        self.destinations = LocationIndex(destination_field)
+        self._seq = 0
+        self._order = {}    # flight_id -> insertion sequence
+        self._entries = {}  # flight_id -> (route, entry) while indexed
+        self._routes = {}   # origin -> destination -> ([prices], [(price, seq, flight_id)])
+
+    def refresh(self, flight_id, flight):
+        """Add, move or drop a flight so the index matches its current state"""
+        with self._lock:
+            self._refresh(flight_id, flight)
+
+    def _refresh(self, flight_id, flight):
+        if flight_id not in self._order:
+            self._order[flight_id] = self._seq
+            self._seq += 1
+        self.origins.add(flight_id, flight)
+        self.destinations.add(flight_id, flight)
+
+        route = (normalize(flight[self.origins.field]), normalize(flight[self.destinations.field]))
+        entry = (flight[self.price_field], self._order[flight_id], flight_id)
+        bookable = flight[self.seats_field] > 0
+
+        if self._entries.get(flight_id) == (route, entry) and bookable:
+            return
+        self._unlink(flight_id)
+        if not bookable:
+            return
+
+        prices, entries = self._routes.setdefault(route[0], {}).setdefault(route[1], ([], []))
+        position = bisect_right(entries, entry)
+        entries.insert(position, entry)
+        prices.insert(position, entry[0])
+        self._entries[flight_id] = (route, entry)
+
+    def remove(self, flight_id):
+        """Drop a flight from the index entirely"""
+        with self._lock:
+            self._unlink(flight_id)
+            self.origins.remove(flight_id)
+            self.destinations.remove(flight_id)
+            self._order.pop(flight_id, None)
+
+    def _unlink(self, flight_id):
+        if flight_id not in self._entries:
+            return
+        (origin, destination), entry = self._entries.pop(flight_id)
+        by_destination = self._routes[origin]
+        prices, entries = by_destination[destination]
+        position = bisect_left(entries, entry)
+        del entries[position]
+        del prices[position]
+        if not entries:
+            del by_destination[destination]
+            if not by_destination:
+                del self._routes[origin]
+
+    def lookup(self, origin=None, destination=None, max_price=None):
+        """Iterate IDs of bookable flights matching the route query, cheapest first
+
+        The matching slice of each route is copied under the lock; they are
+        merged lazily, so a caller that stops after one page stops merging.
+        """
+        wanted = self.destinations.match_keys(destination) if destination else None
+
+        routes = []
+        with self._lock:
+            origins = self.origins.match_keys(origin) if origin else list(self._routes)
+            for origin_key in origins:
+                by_destination = self._routes.get(origin_key)
+                if not by_destination:
+                    continue
+                if wanted is None:
+                    destination_keys = by_destination.keys()
+                elif len(wanted) < len(by_destination):
+                    destination_keys = [key for key in wanted if key in by_destination]
+                else:
+                    destination_keys = [key for key in by_destination if key in wanted]
+
+                for destination_key in destination_keys:
+                    prices, entries = by_destination[destination_key]
+                    end = bisect_right(prices, max_price) if max_price else len(entries)
+                    if end:
+                        routes.append(entries[:end])
+
+        return (entry[2] for entry in heapq.merge(*routes))
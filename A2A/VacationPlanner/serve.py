@@ -0,0 +1,93 @@
+"""
+Production Server - runs a remote agent's Flask app under gunicorn instead of the debug server
+Usage: python serve.py hotel|flight   (pip install gunicorn)
+
+  AGENT_THREADS            request threads per worker (default 16)
+  AGENT_WORKERS            worker processes (default 1, see below)
+  AGENT_PRELOAD=1          import the agent once in the master before forking workers
+  AGENT_GRACEFUL_TIMEOUT   seconds in-flight requests get to finish on reload/stop (default 30)
+  AGENT_BIND               listen address (default 0.0.0.0:5000 / 0.0.0.0:5001)
+
+Graceful reload: kill -HUP <master pid>. A new worker is started and the old
+one finishes its in-flight requests; with a wal:/sqlite: store the new worker
+waits for the old one to release the store, then recovers every booking.
+
+Room and seat availability lives in the worker's memory, so each agent runs
+as a single worker process and scales with threads; AGENT_WORKERS above 1 is
+refused rather than letting workers sell the same rooms twice. Preloading is
+only allowed with the in-memory store (the master must not open a durable
+store that its workers would then share); reloading then starts again from
+the state at boot, as a restart would.
+"""
+
+import importlib
+import os
+import sys
+
+from gunicorn.app.base import BaseApplication
+
+AGENTS = {
+    # name: (module, default port, environment variables selecting durable storage)
+    "hotel": ("hotel_booking_agent", 5000, ("HOTEL_BACKEND", "HOTEL_BOOKING_STORE")),
+    "flight": ("flight_booking_agent", 5001, ("FLIGHT_BACKEND", "FLIGHT_BOOKING_STORE"))
+}
+
+
+class AgentServer(BaseApplication):
+    """gunicorn application serving one agent module's Flask app"""
+
+    def __init__(self, module_name, options):
+        self.module_name = module_name
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return importlib.import_module(self.module_name).app
+
+
+def server_options(agent):
+    """gunicorn settings for an agent from the AGENT_* environment variables"""
+    module_name, port, storage_variables = AGENTS[agent]
+    workers = int(os.environ.get("AGENT_WORKERS", "1"))
+    if workers != 1:
+        raise SystemExit("AGENT_WORKERS must be 1: availability is held in process memory, "
+                         "so scale an agent with AGENT_THREADS instead")
+
+    preload = os.environ.get("AGENT_PRELOAD", "0") == "1"
+    if preload and any(os.environ.get(name, "memory") != "memory" for name in storage_variables):
+        raise SystemExit("AGENT_PRELOAD=1 needs the in-memory store; "
+                         f"unset {' and '.join(storage_variables)} or disable preloading")
+
+    graceful_timeout = int(os.environ.get("AGENT_GRACEFUL_TIMEOUT", "30"))
+    return {
+        "bind": os.environ.get("AGENT_BIND", f"0.0.0.0:{port}"),
+        "workers": workers,
+        "worker_class": "gthread",
+        "threads": int(os.environ.get("AGENT_THREADS", "16")),
+        "preload_app": preload,
+        "graceful_timeout": graceful_timeout,
+        # A reloaded worker may wait for its predecessor's store lock while booting
+        "timeout": graceful_timeout + 30,
+        "keepalive": 60
+    }
+
+
+def main():
+    if len(sys.argv) != 2 or sys.argv[1] not in AGENTS:
+        raise SystemExit(f"Usage: python serve.py {'|'.join(AGENTS)}")
+    agent = sys.argv[1]
+    options = server_options(agent)
+
+    print("="*70)
+    print(f"{agent.title()} Booking Agent (gunicorn, {options['threads']} threads)")
+    print("="*70)
+    print(f"Listening on {options['bind']}")
+    AgentServer(AGENTS[agent][0], options).run()
+
+
+if __name__ == "__main__":
+    main()
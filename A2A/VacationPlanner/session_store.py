@@ -0,0 +1,80 @@
+"""
+Session Store - bounded per-conversation state for the host server (host_server.py)
+Sessions are evicted least-recently-used when the store is full and after an idle timeout
+"""
+
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+
+
+class ChatSession:
+    """One conversation: its chat history and a lock serializing its turns"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.chat_history = []
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """Sessions kept in least-recently-used order, for use from one event loop
+
+    get_or_create() refreshes a session's position; once max_sessions is
+    reached the least recently used one is dropped. evict_idle() removes
+    sessions unused for idle_timeout seconds and is run periodically.
+    """
+
+    def __init__(self, max_sessions=10000, idle_timeout=1800):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id):
+        """Return a live session and mark it used, or None"""
+        if not isinstance(session_id, str):
+            return None
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def get_or_create(self, session_id=None):
+        """Return the live session for session_id, or start one under a new ID
+
+        Only IDs issued here are honoured: an unknown (or non-string) ID gets
+        a fresh session with a fresh ID, so clients cannot choose session IDs.
+        """
+        session = self.get(session_id)
+        if session is None:
+            session = ChatSession(secrets.token_urlsafe(16))
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        return session
+
+    def remove(self, session_id):
+        """End a session; returns whether it existed"""
+        return self._sessions.pop(session_id, None) is not None
+
+    def evict_idle(self, now=None):
+        """Drop sessions idle for longer than idle_timeout; returns how many were dropped"""
+        deadline = (now if now is not None else time.monotonic()) - self.idle_timeout
+        dropped = 0
+        # Oldest first, so stop at the first session used after the deadline
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_used > deadline or session.lock.locked():
+                break
+            self._sessions.popitem(last=False)
+            dropped += 1
+        self.evicted += dropped
+        return dropped
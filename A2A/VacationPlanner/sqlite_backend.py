@@ -0,0 +1,341 @@
+"""
+SQLite Backend - optional storage for catalogs and bookings of both remote agents
+Enable with HOTEL_BACKEND=sqlite:<file> / FLIGHT_BACKEND=sqlite:<file>
+
+The database runs in WAL mode with one connection per thread. SQL text is
+kept constant so sqlite3's per-connection statement cache reuses prepared
+statements. Searches are indexed queries whose rows are converted lazily
+as the caller pages through them; price-sorted pages push the order, the
+cursor and the page size into SQL. Every booking write is its own
+transaction.
+"""
+
+import json
+import sqlite3
+import threading
+
+from booking_store import lock_exclusive
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    location_key TEXT NOT NULL,
+    price_per_night REAL NOT NULL,
+    available_rooms INTEGER NOT NULL,
+    rating REAL NOT NULL,
+    amenities TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hotels_location ON hotels (location_key);
+CREATE INDEX IF NOT EXISTS hotels_price_id ON hotels (price_per_night, id);
+CREATE TABLE IF NOT EXISTS hotel_locations (key TEXT PRIMARY KEY) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS flights (
+    id TEXT PRIMARY KEY,
+    airline TEXT NOT NULL,
+    flight_number TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    origin_key TEXT NOT NULL,
+    destination_key TEXT NOT NULL,
+    departure_time TEXT NOT NULL,
+    arrival_time TEXT NOT NULL,
+    price REAL NOT NULL,
+    available_seats INTEGER NOT NULL,
+    class TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flights_route ON flights (origin_key, destination_key, price);
+CREATE INDEX IF NOT EXISTS flights_price_id ON flights (price, id);
+CREATE TABLE IF NOT EXISTS flight_cities (key TEXT PRIMARY KEY) WITHOUT ROWID;
+"""
+
+BOOKINGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+# Substring matches are resolved against the small table of distinct
+# locations, then joined to the main table through its location index
+HOTEL_FILTERS = """
+WHERE (:location IS NULL OR location_key IN
+        (SELECT key FROM hotel_locations WHERE instr(key, :location) > 0))
+  AND (:max_price IS NULL OR price_per_night <= :max_price)
+  AND (:min_rating IS NULL OR rating >= :min_rating)
+"""
+SEARCH_HOTELS = f"SELECT * FROM hotels {HOTEL_FILTERS} ORDER BY rowid"
+# Price order with the keyset condition of a cursor, skipping the sold-out
+# hotels the search tool would drop anyway; LIMIT -1 means no limit
+SEARCH_HOTELS_BY_PRICE = f"""
+SELECT * FROM hotels {HOTEL_FILTERS}
+  AND available_rooms > 0
+  AND (:after_price IS NULL OR (price_per_night, id) > (:after_price, :after_id))
+ORDER BY price_per_night, id
+LIMIT :limit
+"""
+GET_HOTEL = "SELECT * FROM hotels WHERE id = ?"
+UPSERT_HOTEL = """
+INSERT OR REPLACE INTO hotels
+    (id, name, location, location_key, price_per_night, available_rooms, rating, amenities)
+VALUES (:id, :name, :location, :location_key, :price_per_night, :available_rooms, :rating, :amenities)
+"""
+ADD_HOTEL_LOCATION = "INSERT OR IGNORE INTO hotel_locations (key) VALUES (?)"
+
+FLIGHT_FILTERS = """
+WHERE (:origin IS NULL OR origin_key IN
+        (SELECT key FROM flight_cities WHERE instr(key, :origin) > 0))
+  AND (:destination IS NULL OR destination_key IN
+        (SELECT key FROM flight_cities WHERE instr(key, :destination) > 0))
+  AND (:max_price IS NULL OR price <= :max_price)
+  AND available_seats > 0
+"""
+SEARCH_FLIGHTS = f"SELECT * FROM flights {FLIGHT_FILTERS} ORDER BY price, rowid"
+SEARCH_FLIGHTS_BY_PRICE = f"""
+SELECT * FROM flights {FLIGHT_FILTERS}
+  AND (:after_price IS NULL OR (price, id) > (:after_price, :after_id))
+ORDER BY price, id
+LIMIT :limit
+"""
+GET_FLIGHT = "SELECT * FROM flights WHERE id = ?"
+ALL_FLIGHTS = "SELECT * FROM flights ORDER BY rowid"
+UPSERT_FLIGHT = """
+INSERT OR REPLACE INTO flights
+    (id, airline, flight_number, origin, destination, origin_key, destination_key,
+     departure_time, arrival_time, price, available_seats, class)
+VALUES (:id, :airline, :flight_number, :origin, :destination, :origin_key, :destination_key,
+        :departure_time, :arrival_time, :price, :available_seats, :class)
+"""
+ADD_FLIGHT_CITY = "INSERT OR IGNORE INTO flight_cities (key) VALUES (?)"
+
+
+def _number(value):
+    """Return REAL columns as int when they hold whole numbers, as the dict catalogs do"""
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+class SQLiteDatabase:
+    """SQLite file shared by a catalog and a booking store, one connection per thread"""
+
+    def __init__(self, path, statement_cache_size=128):
+        self.path = path
+        self.statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        """Return this thread's connection, opening it on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                         check_same_thread=False,
+                                         cached_statements=self.statement_cache_size)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def transaction(self):
+        """Context manager running a write transaction on this thread's connection"""
+        return _Transaction(self.connection())
+
+    def close(self):
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+class _Transaction:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class SQLiteHotelCatalog:
+    """Hotel catalog stored in SQLite (same interface as catalog.MemoryHotelCatalog)"""
+
+    def __init__(self, database, seed=None):
+        self.database = database
+        if seed and database.connection().execute("SELECT 1 FROM hotels LIMIT 1").fetchone() is None:
+            with database.transaction() as connection:
+                for hotel in seed.values():
+                    self._upsert(connection, hotel)
+
+    @staticmethod
+    def _to_dict(row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "location": row["location"],
+            "price_per_night": _number(row["price_per_night"]),
+            "available_rooms": row["available_rooms"],
+            "rating": row["rating"],
+            "amenities": json.loads(row["amenities"])
+        }
+
+    @staticmethod
+    def _upsert(connection, hotel):
+        key = hotel["location"].lower()
+        connection.execute(UPSERT_HOTEL, dict(hotel, location_key=key, amenities=json.dumps(hotel["amenities"])))
+        connection.execute(ADD_HOTEL_LOCATION, (key,))
+
+    def get(self, hotel_id):
+        row = self.database.connection().execute(GET_HOTEL, (hotel_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def add(self, hotel):
+        with self.database.transaction() as connection:
+            self._upsert(connection, hotel)
+
+    def search(self, location=None, max_price=None, min_rating=None):
+        rows = self.database.connection().execute(SEARCH_HOTELS, {
+            "location": location.lower() if location else None,
+            "max_price": max_price or None,
+            "min_rating": min_rating or None
+        })
+        return map(self._to_dict, rows)
+
+    def search_by_price(self, location=None, max_price=None, min_rating=None, after=None, limit=None):
+        """Matching hotels with rooms, ordered by (price_per_night, id), starting after the key `after`"""
+        if after is not None and len(after) != 2:
+            raise ValueError("Invalid cursor")
+        after_price, after_id = after or (None, None)
+        rows = self.database.connection().execute(SEARCH_HOTELS_BY_PRICE, {
+            "location": location.lower() if location else None,
+            "max_price": max_price or None,
+            "min_rating": min_rating or None,
+            "after_price": after_price,
+            "after_id": after_id,
+            "limit": -1 if limit is None else limit
+        })
+        return map(self._to_dict, rows)
+
+
+class SQLiteFlightCatalog:
+    """Flight catalog stored in SQLite (same interface as catalog.MemoryFlightCatalog)"""
+
+    def __init__(self, database, seed=None):
+        self.database = database
+        if seed and database.connection().execute("SELECT 1 FROM flights LIMIT 1").fetchone() is None:
+            with database.transaction() as connection:
+                for flight in seed.values():
+                    self._upsert(connection, flight)
+
+    @staticmethod
+    def _to_dict(row):
+        return {
+            "id": row["id"],
+            "airline": row["airline"],
+            "flight_number": row["flight_number"],
+            "origin": row["origin"],
+            "destination": row["destination"],
+            "departure_time": row["departure_time"],
+            "arrival_time": row["arrival_time"],
+            "price": _number(row["price"]),
+            "available_seats": row["available_seats"],
+            "class": row["class"]
+        }
+
+    @staticmethod
+    def _upsert(connection, flight):
+        origin_key = flight["origin"].lower()
+        destination_key = flight["destination"].lower()
+        connection.execute(UPSERT_FLIGHT, dict(flight, origin_key=origin_key, destination_key=destination_key))
+        connection.execute(ADD_FLIGHT_CITY, (origin_key,))
+        connection.execute(ADD_FLIGHT_CITY, (destination_key,))
+
+    def get(self, flight_id):
+        row = self.database.connection().execute(GET_FLIGHT, (flight_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def all(self):
+        return [self._to_dict(row) for row in self.database.connection().execute(ALL_FLIGHTS)]
+
+    def add(self, flight):
+        with self.database.transaction() as connection:
+            self._upsert(connection, flight)
+
+    def search(self, origin=None, destination=None, max_price=None):
+        rows = self.database.connection().execute(SEARCH_FLIGHTS, {
+            "origin": origin.lower() if origin else None,
+            "destination": destination.lower() if destination else None,
+            "max_price": max_price or None
+        })
+        return map(self._to_dict, rows)
+
+    def search_by_price(self, origin=None, destination=None, max_price=None, after=None, limit=None):
+        """Matching flights ordered by (price, id), starting after the key `after`"""
+        if after is not None and len(after) != 2:
+            raise ValueError("Invalid cursor")
+        after_price, after_id = after or (None, None)
+        rows = self.database.connection().execute(SEARCH_FLIGHTS_BY_PRICE, {
+            "origin": origin.lower() if origin else None,
+            "destination": destination.lower() if destination else None,
+            "max_price": max_price or None,
+            "after_price": after_price,
+            "after_id": after_id,
+            "limit": -1 if limit is None else limit
+        })
+        return map(self._to_dict, rows)
+
+
+class SQLiteBookingStore:
+    """Booking store in a SQLite table (same dict-like interface as booking_store.py)"""
+
+    def __init__(self, database, table):
+        self.database = database
+        self.table = table
+        # One owning process per table: availability is rebuilt from it at startup
+        self._lock_file = lock_exclusive(f"{database.path}.{table}.lock")
+        database.connection().execute(BOOKINGS_SCHEMA.format(table=table))
+        self._get = f"SELECT data FROM {table} WHERE id = ?"
+        self._put = f"INSERT OR REPLACE INTO {table} (id, status, data) VALUES (?, ?, ?)"
+        self._all = f"SELECT data FROM {table} ORDER BY rowid"
+        self._ids = f"SELECT id FROM {table} ORDER BY rowid"
+        self._count = f"SELECT count(*) FROM {table}"
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        booking = self.get(key)
+        if booking is None:
+            raise KeyError(key)
+        return booking
+
+    def __setitem__(self, key, value):
+        with self.database.transaction() as connection:
+            connection.execute(self._put, (key, value.get("status", ""), json.dumps(value)))
+
+    def __len__(self):
+        return self.database.connection().execute(self._count).fetchone()[0]
+
+    def __iter__(self):
+        return iter([row[0] for row in self.database.connection().execute(self._ids)])
+
+    def get(self, key, default=None):
+        row = self.database.connection().execute(self._get, (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def values(self):
+        return [json.loads(row[0]) for row in self.database.connection().execute(self._all)]
+
+    def close(self):
+        self.database.close()
+        self._lock_file.close()
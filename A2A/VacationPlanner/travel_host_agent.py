@@ -1,13 +1,25 @@
 """
 Travel Host Agent - Uses Google ADK with A2A Communication
 Run this after starting hotel_booking_agent.py: python travel_host_agent.py
+Tool calls and their results are logged at DEBUG (AGENT_LOG_LEVEL=DEBUG to see them)
 """
 
+import hashlib
+import json
 import os
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from google import genai
 from google.genai import types
 
+from a2a_codec import decode, json_codec, request_headers
+from a2a_http import create_session, post_body
+from agent_logging import get_logger
+from capabilities_cache import CapabilitiesCache
+from chat_history import HistoryManager
+from response_shaper import MORE_RESULTS_DECLARATION, MORE_RESULTS_TOOL, ResponseShaper
+
 # Set your API key
 # os.environ["GOOGLE_API_KEY"] = "your-google-api-key-here"
 
@@ -15,94 +27,177 @@ from google.genai import types
 HOTEL_AGENT_URL = "http://localhost:5000"
 FLIGHT_AGENT_URL = "http://localhost:5001"
 
+MODEL_NAME = "gemini-2.0-flash-exp"
+
+logger = get_logger("TravelHostAgent")
+
+# Tool dispatch: send a turn's calls to different agents concurrently (A2A_PARALLEL_TOOLS=0 to disable)
+PARALLEL_TOOL_CALLS = os.environ.get("A2A_PARALLEL_TOOLS", "1") != "0"
+# Maximum in-flight requests per remote agent
+AGENT_MAX_CONCURRENCY = int(os.environ.get("A2A_AGENT_MAX_CONCURRENCY", "4"))
+
+# On-disk copy of each agent's capabilities, reused while fresh (A2A_CAPABILITIES_CACHE)
+discovery_cache = CapabilitiesCache()
+
+# Keeps the history sent to the model within A2A_HISTORY_TOKEN_BUDGET
+history_manager = HistoryManager()
+# Caps and pages the tool results fed back to the model (A2A_TOOL_MAX_ITEMS)
+response_shaper = ResponseShaper()
+
+_dispatch_pool = None
+_dispatch_pool_lock = threading.Lock()
+
+
+def get_dispatch_pool():
+    """Shared worker pool for concurrent tool dispatch"""
+    global _dispatch_pool
+    with _dispatch_pool_lock:
+        if _dispatch_pool is None:
+            _dispatch_pool = ThreadPoolExecutor(max_workers=4 * AGENT_MAX_CONCURRENCY,
+                                                thread_name_prefix="a2a-dispatch")
+    return _dispatch_pool
+
+
+# Compiled ADK declarations by capability hash, and generation configs built from them
+_compiled_tools = {}
+_agent_configs = {}
+
+
+def capabilities_hash(capabilities):
+    """Stable hash of an agent's tool definitions"""
+    document = json.dumps(capabilities.get('tools', []), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
+def adk_tools_from_capabilities(capabilities):
+    """Convert an agent's advertised tools to Google ADK tool declarations
+    
+    All of the agent's functions go into a single types.Tool, compiled once
+    per distinct set of tool definitions.
+    """
+    if not capabilities or 'tools' not in capabilities:
+        return []
+    
+    key = capabilities_hash(capabilities)
+    adk_tool = _compiled_tools.get(key)
+    if adk_tool is None:
+        # Convert remote tools to ADK format
+        adk_tool = types.Tool(
+            function_declarations=[
+                types.FunctionDeclaration(
+                    name=tool['name'],
+                    description=tool['description'],
+                    parameters=tool['parameters']
+                )
+                for tool in capabilities['tools']
+            ]
+        )
+        _compiled_tools[key] = adk_tool
+    
+    return [adk_tool]
+
+
+def count_functions(adk_tools):
+    """Number of function declarations in a list of ADK tools"""
+    return sum(len(tool.function_declarations or []) for tool in adk_tools)
+
 
 class A2AHotelClient:
     """Client for communicating with remote Hotel Booking Agent via A2A"""
     
-    def __init__(self, agent_url):
+    def __init__(self, agent_url, max_concurrency=None, pool_size=None, http2=None):
         self.agent_url = agent_url
         self.capabilities = None
+        # Caps in-flight requests to this agent, however many callers share the client
+        self._slots = threading.BoundedSemaphore(max_concurrency or AGENT_MAX_CONCURRENCY)
+        # Keep-alive connection pool reused by every call to this agent
+        self.session = create_session(pool_size=pool_size, http2=http2)
+        # Request bodies are JSON; replies come in any media type a2a_codec can decode
+        self.request_headers = request_headers(json_codec)
         self._discover_agent()
     
     def _discover_agent(self):
-        """Discover remote agent capabilities (A2A Discovery)"""
-        try:
-            response = requests.get(f"{self.agent_url}/agent/capabilities", timeout=5)
-            if response.status_code == 200:
-                self.capabilities = response.json()
-                print(f"✓ Connected to {self.capabilities['agent_name']}")
-                print(f"  Protocol: {self.capabilities.get('protocol', 'unknown')}")
-                print(f"  Available tools: {len(self.capabilities['tools'])}")
-                for tool in self.capabilities['tools']:
-                    print(f"    - {tool['name']}")
-            else:
-                print(f"⚠ Agent discovery failed")
-        except Exception as e:
-            print(f"✗ Cannot connect to Hotel Booking Agent: {e}")
-            print(f"  Make sure hotel_booking_agent.py is running on {self.agent_url}")
+        """Discover remote agent capabilities (A2A Discovery)
+        
+        A fresh on-disk copy is used without contacting the agent; an expired
+        one is revalidated with If-None-Match.
+        """
+        cached = discovery_cache.load(self.agent_url)
+        if discovery_cache.is_fresh(cached):
+            self.capabilities = cached['capabilities']
+            source = "cached"
+        else:
+            try:
+                response = self.session.get(f"{self.agent_url}/agent/capabilities",
+                                            headers=discovery_cache.conditional_headers(cached), timeout=5)
+                self.capabilities = discovery_cache.revalidate(self.agent_url, cached, response)
+                if self.capabilities is None:
+                    print(f"⚠ Agent discovery failed")
+                    return
+                source = "revalidated" if response.status_code == 304 else "fetched"
+            except Exception as e:
+                print(f"✗ Cannot connect to Hotel Booking Agent: {e}")
+                print(f"  Make sure hotel_booking_agent.py is running on {self.agent_url}")
+                return
+        
+        print(f"✓ Connected to {self.capabilities['agent_name']} ({source})")
+        print(f"  Protocol: {self.capabilities.get('protocol', 'unknown')}")
+        print(f"  Available tools: {len(self.capabilities['tools'])}")
+        for tool in self.capabilities['tools']:
+            print(f"    - {tool['name']}")
+    
+    def _post(self, path, payload):
+        """Send an A2A request and decode the reply by its Content-Type"""
+        with self._slots:
+            response = post_body(self.session, f"{self.agent_url}{path}", json_codec.dumps(payload),
+                                 self.request_headers, timeout=30)
+        return decode(response.content, response.headers.get("Content-Type"))
     
     def call_tool(self, tool_name, parameters):
         """Call a tool on the remote agent (A2A Communication)"""
         try:
-            response = requests.post(
-                f"{self.agent_url}/agent/execute",
-                json={"tool_name": tool_name, "parameters": parameters},
-                timeout=30
-            )
-            return response.json()
+            return self._post("/agent/execute", {"tool_name": tool_name, "parameters": parameters})
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Failed to communicate with hotel agent: {str(e)}"
             }
     
-    def get_adk_tools(self):
-        """Convert remote agent capabilities to Google ADK tool declarations"""
-        if not self.capabilities or 'tools' not in self.capabilities:
-            return []
+    def supports_batch(self):
+        """Whether the remote agent advertised the batch execution endpoint"""
+        return bool(self.capabilities and self.capabilities.get('supports_batch'))
+    
+    def call_tools(self, calls):
+        """Call several tools in one round trip (A2A batch); results come back in call order
         
-        # Convert remote tools to ADK format
-        adk_tools = []
-        for tool in self.capabilities['tools']:
-            adk_tool = types.Tool(
-                function_declarations=[
-                    types.FunctionDeclaration(
-                        name=tool['name'],
-                        description=tool['description'],
-                        parameters=tool['parameters']
-                    )
-                ]
-            )
-            adk_tools.append(adk_tool)
+        calls is a list of (tool_name, parameters) pairs. Agents that do not
+        advertise batch support get one request per call instead.
+        """
+        if not calls:
+            return []
+        if not self.supports_batch():
+            return [self.call_tool(tool_name, parameters) for tool_name, parameters in calls]
         
-        return adk_tools
-
-
-def create_travel_agent():
-    """Create the Google ADK agent with hotel and flight booking tools"""
-    
-    # Initialize Google ADK client
-    client = genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"))
-    
-    # Initialize A2A clients for both agents
-    hotel_client = A2AHotelClient(HOTEL_AGENT_URL)
-    flight_client = A2AHotelClient(FLIGHT_AGENT_URL)  # Reusing the same client class
-    
-    # Get tools from both remote agents
-    hotel_tools = hotel_client.get_adk_tools()
-    flight_tools = flight_client.get_adk_tools()
-    
-    all_tools = hotel_tools + flight_tools
-    
-    if not all_tools:
-        print("⚠ Warning: No tools discovered from remote agents")
-        return None, None, None, None
+        try:
+            reply = self._post("/agent/execute_batch", {"calls": [{"tool_name": tool_name, "parameters": parameters}
+                                                                   for tool_name, parameters in calls]})
+            return reply['results']
+        except Exception as e:
+            return [{
+                "success": False,
+                "error": f"Failed to communicate with hotel agent: {str(e)}"
+            } for _ in calls]
     
-    print(f"✓ Loaded {len(hotel_tools)} hotel tools and {len(flight_tools)} flight tools")
+    def get_adk_tools(self):
+        """Convert remote agent capabilities to Google ADK tool declarations"""
+        return adk_tools_from_capabilities(self.capabilities)
     
-    # Create agent config
-    config = types.GenerateContentConfig(
-        system_instruction="""You are a helpful travel assistant that can help users search for and book hotels AND flights.
+    def close(self):
+        """Close the pooled connections to the remote agent"""
+        self.session.close()
+
+
+SYSTEM_INSTRUCTION = """You are a helpful travel assistant that can help users search for and book hotels AND flights.
 
 You have access to two A2A (Agent-to-Agent) services:
 1. Hotel Booking Service - for searching and booking hotels
@@ -128,51 +223,158 @@ For Flights:
 
 Always be conversational, helpful, and confirm important details such as first name and email before making bookings.
 Use dates in YYYY-MM-DD format for all bookings. If year is not provided in the given dates, use 2025 as year.
-When users ask about travel, consider suggesting both flight and hotel options.""",
-        tools=all_tools,
+When users ask about travel, consider suggesting both flight and hotel options.
+Long search results come one page at a time; if a result has a continuation_token and the user wants more options, call get_more_results with it."""
+
+
+def create_agent_config(tools):
+    """Generation config for the travel assistant with the given remote tools
+    
+    The same config object is returned for the same compiled tools, so every
+    session shares one.
+    """
+    key = tuple(id(tool) for tool in tools)
+    cached = _agent_configs.get(key)
+    if cached is not None:
+        return cached[1]
+    
+    config = types.GenerateContentConfig(
+        system_instruction=SYSTEM_INSTRUCTION,
+        # Paging of long results is served by the host itself
+        tools=tools + [types.Tool(function_declarations=[MORE_RESULTS_DECLARATION])],
         temperature=0.7
     )
+    # Keep the tools alive with the config so their ids stay unique
+    _agent_configs[key] = (tools, config)
+    return config
+
+
+def create_travel_agent():
+    """Create the Google ADK agent with hotel and flight booking tools"""
+    
+    # Initialize Google ADK client
+    client = genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"))
+    
+    # Initialize A2A clients for both agents
+    hotel_client = A2AHotelClient(HOTEL_AGENT_URL)
+    flight_client = A2AHotelClient(FLIGHT_AGENT_URL)  # Reusing the same client class
+    
+    # Get tools from both remote agents
+    hotel_tools = hotel_client.get_adk_tools()
+    flight_tools = flight_client.get_adk_tools()
+    
+    all_tools = hotel_tools + flight_tools
+    
+    if not all_tools:
+        print("⚠ Warning: No tools discovered from remote agents")
+        return None, None, None, None
+    
+    print(f"✓ Loaded {count_functions(hotel_tools)} hotel tools and {count_functions(flight_tools)} flight tools")
+    
+    # Build the tool routing table now so clashing tool names fail at startup
+    try:
+        get_tool_registry((hotel_client, flight_client))
+    except ValueError as e:
+        print(f"✗ {e}")
+        return None, None, None, None
+    
+    # Create agent config
+    config = create_agent_config(all_tools)
     
     return client, hotel_client, flight_client, config
 
 
-def handle_tool_calls(tool_calls, hotel_client, flight_client):
-    """Handle tool calls by forwarding them to the appropriate remote agent"""
-    responses = []
+class ToolRegistry:
+    """Tool name -> remote agent client, built from each agent's discovered capabilities
+    
+    Any number of agents can be registered; a tool name offered by two agents
+    (or clashing with a host-side tool) is rejected with ValueError.
+    """
+    
+    HOST_TOOLS = (MORE_RESULTS_TOOL,)
     
-    for tool_call in tool_calls:
+    def __init__(self, clients=()):
+        self._routes = {}
+        for client in clients:
+            self.register(client)
+    
+    def register(self, client):
+        """Route every tool the client's agent advertises to that client"""
+        capabilities = client.capabilities or {}
+        agent_name = capabilities.get('agent_name', client.agent_url)
+        for tool in capabilities.get('tools', []):
+            name = tool['name']
+            if name in self.HOST_TOOLS:
+                raise ValueError(f"Tool '{name}' of {agent_name} clashes with a host tool")
+            if name in self._routes:
+                raise ValueError(f"Tool '{name}' is offered by both {self._routes[name][0]} and {agent_name}")
+            self._routes[name] = (agent_name, client)
+    
+    def route(self, function_name):
+        """Pick the remote agent for a tool; returns (agent name, client) or (None, None)"""
+        return self._routes.get(function_name, (None, None))
+
+
+_registries = {}
+
+
+def get_tool_registry(clients):
+    """Registry for a set of clients, built once per set"""
+    key = tuple(id(client) for client in clients)
+    cached = _registries.get(key)
+    if cached is None:
+        # Keep the clients alive with the registry so their ids stay unique
+        cached = _registries[key] = (clients, ToolRegistry(clients))
+    return cached[1]
+
+
+def group_tool_calls(tool_calls, clients):
+    """Route tool calls to the agents of clients
+    
+    Returns (agent_names, results, batches): results is pre-filled with
+    errors for unknown tools, batches maps id(client) to (client, calls)
+    where calls is a list of (index, tool_name, parameters).
+    """
+    registry = get_tool_registry(clients)
+    results = [None] * len(tool_calls)
+    agent_names = [None] * len(tool_calls)
+    batches = {}
+    
+    for index, tool_call in enumerate(tool_calls):
         function_name = tool_call.name
         function_args = tool_call.args
-        print('-------------------------------------------------------------')
-        print(f"\n[Host Agent] Calling remote tool: {function_name}")
-        print(f"  Parameters: {function_args}")
-        agentName = ''
+        logger.debug("tool_call tool=%s parameters=%r", function_name, function_args)
+        if function_name == MORE_RESULTS_TOOL:
+            agent_names[index] = 'Host Agent'
+            results[index] = response_shaper.more((function_args or {}).get('continuation_token'))
+            continue
         # Route to appropriate agent based on tool name
-        if function_name.startswith('search_hotels') or function_name.startswith('get_hotel') or \
-           function_name.startswith('create_booking') or function_name.startswith('get_booking') or \
-           function_name.startswith('cancel_booking'):
-            # Hotel agent
-            agentName = 'Hotel Agent'
-            result = hotel_client.call_tool(function_name, function_args)
-        elif function_name.startswith('search_flights') or function_name.startswith('get_flight') or \
-             function_name.startswith('book_flight') or function_name.startswith('cancel_flight'):
-            # Flight agent
-            agentName = 'Flight Agent'
-            result = flight_client.call_tool(function_name, function_args)
-        else:
-            result = {
+        agent_names[index], client = registry.route(function_name)
+        if client is None:
+            results[index] = {
                 "success": False,
                 "error": f"Unknown tool: {function_name}"
             }
-        
+        else:
+            batches.setdefault(id(client), (client, []))[1].append((index, function_name, function_args))
+    
+    return agent_names, results, batches
+
+
+def build_tool_responses(tool_calls, agent_names, results):
+    """Turn agent results into function response parts, in tool_calls order
+    
+    Long result lists are cut to a page by response_shaper before they reach the model.
+    """
+    responses = []
+    for tool_call, agentName, result in zip(tool_calls, agent_names, results):
+        function_name = tool_call.name
         if result.get('success'):
-            response_data = result['result']
-            print(f"\n********* Response from '{agentName}' : {function_name} ******************** \n")
-            print(f"  ✓ Success: {response_data}")
-            print('-------------------------------------------------------------\n')
+            response_data = response_shaper.shape(result['result'])
+            logger.debug("tool_result agent=%s tool=%s result=%r", agentName, function_name, response_data)
         else:
             response_data = {"error": result.get('error', 'Unknown error')}
-            print(f"  ✗ Error: {response_data}")
+            logger.debug("tool_result agent=%s tool=%s error=%r", agentName, function_name, response_data["error"])
         
         # Create tool response
         responses.append(
@@ -185,6 +387,61 @@ def handle_tool_calls(tool_calls, hotel_client, flight_client):
     return responses
 
 
+def handle_tool_calls(tool_calls, *clients, parallel=None):
+    """Handle tool calls by forwarding them to the appropriate remote agent
+    
+    clients are the A2A clients of every remote agent (hotel, flight, ...);
+    each call goes to the agent that advertised the tool.
+    Calls are grouped per remote agent and sent as one batch request each.
+    With parallel dispatch (PARALLEL_TOOL_CALLS by default) the agents are
+    called concurrently, and agents without batch support get their calls
+    fanned out up to the client's concurrency cap. Responses keep the order
+    of tool_calls.
+    """
+    if parallel is None:
+        parallel = PARALLEL_TOOL_CALLS
+    agent_names, results, batches = group_tool_calls(tool_calls, clients)
+    
+    # Each job is (indexes it fills, function returning their results)
+    jobs = []
+    for client, calls in batches.values():
+        if client.supports_batch() or not parallel:
+            jobs.append(([index for index, _, _ in calls],
+                         lambda client=client, calls=calls: client.call_tools([(name, args) for _, name, args in calls])))
+        else:
+            for index, name, args in calls:
+                jobs.append(([index], lambda client=client, name=name, args=args: [client.call_tool(name, args)]))
+    
+    if parallel and len(jobs) > 1:
+        pool = get_dispatch_pool()
+        futures = [(indexes, pool.submit(job)) for indexes, job in jobs]
+        completed = [(indexes, future.result()) for indexes, future in futures]
+    else:
+        completed = [(indexes, job()) for indexes, job in jobs]
+    
+    for indexes, job_results in completed:
+        for index, result in zip(indexes, job_results):
+            results[index] = result
+    
+    return build_tool_responses(tool_calls, agent_names, results)
+
+
+def extract_tool_calls(response):
+    """Return the function calls of a model response (empty when it answered in text)"""
+    if not response.candidates[0].content.parts:
+        return []
+    first_part = response.candidates[0].content.parts[0]
+    if not (hasattr(first_part, 'function_call') and first_part.function_call):
+        return []
+    
+    # Extract all function calls from parts
+    tool_calls = []
+    for part in response.candidates[0].content.parts:
+        if hasattr(part, 'function_call') and part.function_call:
+            tool_calls.append(part.function_call)
+    return tool_calls
+
+
 def chat_loop(client, hotel_client, flight_client, config):
     """Interactive chat loop with the agent"""
     
@@ -216,6 +473,9 @@ def chat_loop(client, hotel_client, flight_client, config):
             continue
         
         try:
+            # Compact older turns before adding the new message
+            history_manager.prepare(chat_history)
+            
             # Add user message to history
             chat_history.append(types.Content(
                 role="user",
@@ -224,7 +484,7 @@ def chat_loop(client, hotel_client, flight_client, config):
             
             # Generate response
             response = client.models.generate_content(
-                model="gemini-2.0-flash-exp",
+                model=MODEL_NAME,
                 contents=chat_history,
                 config=config
             )
@@ -232,36 +492,27 @@ def chat_loop(client, hotel_client, flight_client, config):
             # Process response
             while True:
                 # Check if there are tool calls
-                if response.candidates[0].content.parts:
-                    first_part = response.candidates[0].content.parts[0]
+                tool_calls = extract_tool_calls(response)
+                if tool_calls:
+                    # Add assistant's tool calls to history
+                    chat_history.append(response.candidates[0].content)
+                    
+                    # Handle tool calls via A2A
+                    tool_responses = handle_tool_calls(tool_calls, hotel_client, flight_client)
                     
-                    if hasattr(first_part, 'function_call') and first_part.function_call:
-                        # Extract all function calls from parts
-                        tool_calls = []
-                        for part in response.candidates[0].content.parts:
-                            if hasattr(part, 'function_call') and part.function_call:
-                                tool_calls.append(part.function_call)
-                        
-                        if tool_calls:
-                            # Add assistant's tool calls to history
-                            chat_history.append(response.candidates[0].content)
-                            
-                            # Handle tool calls via A2A
-                            tool_responses = handle_tool_calls(tool_calls, hotel_client, flight_client)
-                            
-                            # Add tool responses to history
-                            chat_history.append(types.Content(
-                                role="user",
-                                parts=tool_responses
-                            ))
-                            
-                            # Generate next response with tool results
-                            response = client.models.generate_content(
-                                model="gemini-2.0-flash-exp",
-                                contents=chat_history,
-                                config=config
-                            )
-                            continue
+                    # Add tool responses to history
+                    chat_history.append(types.Content(
+                        role="user",
+                        parts=tool_responses
+                    ))
+                    
+                    # Generate next response with tool results
+                    response = client.models.generate_content(
+                        model=MODEL_NAME,
+                        contents=chat_history,
+                        config=config
+                    )
+                    continue
                 
                 # No more tool calls, show final response
                 final_text = response.text
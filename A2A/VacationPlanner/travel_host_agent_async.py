@@ -0,0 +1,258 @@
+"""
+Travel Host Agent (asyncio) - same assistant as travel_host_agent.py on one event loop
+Run this after starting the remote agents: python travel_host_agent_async.py
+
+Model calls go through the async genai client (client.aio) and A2A calls
+through a pooled httpx.AsyncClient, so a conversation waiting on either
+never blocks the others. run_turn() handles one user message of one
+session; a server can run thousands of them concurrently in one process.
+"""
+
+import asyncio
+import os
+
+from google import genai
+from google.genai import types
+
+from a2a_codec import decode, json_codec, request_headers
+from a2a_http import create_async_session
+from travel_host_agent import (AGENT_MAX_CONCURRENCY, FLIGHT_AGENT_URL, HOTEL_AGENT_URL, MODEL_NAME,
+                               PARALLEL_TOOL_CALLS, adk_tools_from_capabilities, build_tool_responses,
+                               count_functions, create_agent_config, discovery_cache, extract_tool_calls,
+                               get_tool_registry, group_tool_calls, history_manager)
+
+
+class AsyncA2AClient:
+    """Asyncio client for a remote A2A agent (counterpart of A2AHotelClient)"""
+
+    def __init__(self, agent_url, max_concurrency=None, pool_size=None, http2=None):
+        self.agent_url = agent_url
+        self.capabilities = None
+        # Caps in-flight requests to this agent across every session on the loop
+        self._slots = asyncio.Semaphore(max_concurrency or AGENT_MAX_CONCURRENCY)
+        self.session = create_async_session(pool_size=pool_size, http2=http2)
+        self.request_headers = request_headers(json_codec)
+
+    @classmethod
+    async def connect(cls, agent_url, **kwargs):
+        """Create a client and discover the agent's capabilities"""
+        client = cls(agent_url, **kwargs)
+        await client._discover_agent()
+        return client
+
+    async def _discover_agent(self):
+        """Discover remote agent capabilities (A2A Discovery), reusing the on-disk cache while fresh"""
+        cached = discovery_cache.load(self.agent_url)
+        if discovery_cache.is_fresh(cached):
+            self.capabilities = cached['capabilities']
+            source = "cached"
+        else:
+            try:
+                response = await self.session.get(f"{self.agent_url}/agent/capabilities",
+                                                  headers=discovery_cache.conditional_headers(cached), timeout=5)
+                self.capabilities = discovery_cache.revalidate(self.agent_url, cached, response)
+                if self.capabilities is None:
+                    print(f"⚠ Agent discovery failed")
+                    return
+                source = "revalidated" if response.status_code == 304 else "fetched"
+            except Exception as e:
+                print(f"✗ Cannot connect to agent at {self.agent_url}: {e}")
+                return
+
+        print(f"✓ Connected to {self.capabilities['agent_name']} ({source})")
+        print(f"  Protocol: {self.capabilities.get('protocol', 'unknown')}")
+        print(f"  Available tools: {len(self.capabilities['tools'])}")
+        for tool in self.capabilities['tools']:
+            print(f"    - {tool['name']}")
+
+    async def _post(self, path, payload):
+        """Send an A2A request and decode the reply by its Content-Type"""
+        async with self._slots:
+            response = await self.session.post(f"{self.agent_url}{path}", content=json_codec.dumps(payload),
+                                               headers=self.request_headers, timeout=30)
+        return decode(response.content, response.headers.get("Content-Type"))
+
+    async def call_tool(self, tool_name, parameters):
+        """Call a tool on the remote agent (A2A Communication)"""
+        try:
+            return await self._post("/agent/execute", {"tool_name": tool_name, "parameters": parameters})
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to communicate with agent: {str(e)}"
+            }
+
+    def supports_batch(self):
+        """Whether the remote agent advertised the batch execution endpoint"""
+        return bool(self.capabilities and self.capabilities.get('supports_batch'))
+
+    async def call_tools(self, calls):
+        """Call several tools in one round trip (A2A batch); results come back in call order"""
+        if not calls:
+            return []
+        if not self.supports_batch():
+            return list(await asyncio.gather(*(self.call_tool(name, parameters) for name, parameters in calls)))
+
+        try:
+            reply = await self._post("/agent/execute_batch", {"calls": [{"tool_name": tool_name, "parameters": parameters}
+                                                                         for tool_name, parameters in calls]})
+            return reply['results']
+        except Exception as e:
+            return [{
+                "success": False,
+                "error": f"Failed to communicate with agent: {str(e)}"
+            } for _ in calls]
+
+    def get_adk_tools(self):
+        """Convert remote agent capabilities to Google ADK tool declarations"""
+        return adk_tools_from_capabilities(self.capabilities)
+
+    async def close(self):
+        """Close the pooled connections to the remote agent"""
+        await self.session.aclose()
+
+
+async def create_travel_agent(client=None):
+    """Create the genai client (unless one is given) and discover both remote agents concurrently"""
+    if client is None:
+        client = genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"))
+
+    hotel_client, flight_client = await asyncio.gather(
+        AsyncA2AClient.connect(HOTEL_AGENT_URL),
+        AsyncA2AClient.connect(FLIGHT_AGENT_URL)
+    )
+
+    hotel_tools = hotel_client.get_adk_tools()
+    flight_tools = flight_client.get_adk_tools()
+    all_tools = hotel_tools + flight_tools
+
+    if not all_tools:
+        print("⚠ Warning: No tools discovered from remote agents")
+        return None, None, None, None
+
+    print(f"✓ Loaded {count_functions(hotel_tools)} hotel tools and {count_functions(flight_tools)} flight tools")
+
+    # Build the tool routing table now so clashing tool names fail at startup
+    try:
+        get_tool_registry((hotel_client, flight_client))
+    except ValueError as e:
+        print(f"✗ {e}")
+        return None, None, None, None
+    return client, hotel_client, flight_client, create_agent_config(all_tools)
+
+
+async def handle_tool_calls(tool_calls, *clients, parallel=None):
+    """Forward tool calls to the agents of clients; responses keep the order of tool_calls"""
+    if parallel is None:
+        parallel = PARALLEL_TOOL_CALLS
+    agent_names, results, batches = group_tool_calls(tool_calls, clients)
+
+    async def run_batch(client, calls):
+        batch_results = await client.call_tools([(name, args) for _, name, args in calls])
+        for (index, _, _), result in zip(calls, batch_results):
+            results[index] = result
+
+    batch_runs = [run_batch(client, calls) for client, calls in batches.values()]
+    if parallel:
+        await asyncio.gather(*batch_runs)
+    else:
+        for batch_run in batch_runs:
+            await batch_run
+
+    return build_tool_responses(tool_calls, agent_names, results)
+
+
+async def run_turn(client, hotel_client, flight_client, config, chat_history, user_input):
+    """Process one user message of a conversation and return the agent's reply
+
+    chat_history is the session's own list; older turns are compacted to
+    the history budget, the new turn is appended in place and removed
+    again if the turn fails.
+    """
+    history_manager.prepare(chat_history)
+    turn_start = len(chat_history)
+    try:
+        chat_history.append(types.Content(
+            role="user",
+            parts=[types.Part(text=user_input)]
+        ))
+        response = await client.aio.models.generate_content(
+            model=MODEL_NAME,
+            contents=chat_history,
+            config=config
+        )
+
+        tool_calls = extract_tool_calls(response)
+        while tool_calls:
+            chat_history.append(response.candidates[0].content)
+            tool_responses = await handle_tool_calls(tool_calls, hotel_client, flight_client)
+            chat_history.append(types.Content(
+                role="user",
+                parts=tool_responses
+            ))
+            response = await client.aio.models.generate_content(
+                model=MODEL_NAME,
+                contents=chat_history,
+                config=config
+            )
+            tool_calls = extract_tool_calls(response)
+
+        final_text = response.text
+        chat_history.append(types.Content(
+            role="model",
+            parts=[types.Part(text=final_text)]
+        ))
+        return final_text
+    except BaseException:
+        del chat_history[turn_start:]
+        raise
+
+
+async def chat_loop(client, hotel_client, flight_client, config):
+    """Interactive chat loop; reading the terminal runs in a thread so the loop stays free"""
+    print("\n" + "="*70)
+    print("Travel Assistant Ready! (asyncio)")
+    print("="*70)
+    print("\nType 'quit' to exit\n")
+
+    chat_history = []
+
+    while True:
+        user_input = (await asyncio.to_thread(input, "\nYou: ")).strip()
+
+        if user_input.lower() in ['quit', 'exit', 'q']:
+            print("Goodbye!")
+            break
+
+        if not user_input:
+            continue
+
+        try:
+            final_text = await run_turn(client, hotel_client, flight_client, config, chat_history, user_input)
+            print(f"\nAgent: {final_text}")
+        except Exception as e:
+            print(f"\nError: {str(e)}")
+
+
+async def main():
+    """Run the asyncio travel host agent"""
+    print("="*70)
+    print("Travel Host Agent with Google ADK - A2A Communication (asyncio)")
+    print("Multi-Agent System: Hotels + Flights")
+    print("="*70)
+    print("\nInitializing agent...")
+
+    client, hotel_client, flight_client, config = await create_travel_agent()
+    if client is None:
+        print("Failed to initialize agent. Exiting.")
+        return
+
+    print("\n✓ Agent ready!")
+    try:
+        await chat_loop(client, hotel_client, flight_client, config)
+    finally:
+        await asyncio.gather(hotel_client.close(), flight_client.close())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())